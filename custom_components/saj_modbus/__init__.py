@@ -1,21 +1,42 @@
 """The SAJ Modbus Integration."""
 
 import logging
+import time
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_SCAN_INTERVAL
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.importlib import async_import_module
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import slugify
 
 from .const import (
     ATTR_MANUFACTURER,
+    CONF_CLOCK_SYNC_THRESHOLD,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_MAX_DATA_AGE,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_READ_GAP,
+    CONF_RECORD_FRAMES,
+    CONF_REPLAY_FILE,
+    CONF_REPLAY_SPEED,
+    CONF_SLOW_SCAN_INTERVAL,
+    CONF_UNIT_ID,
+    CONF_WRITE_INTERVAL,
+    DEFAULT_CLOCK_SYNC_THRESHOLD,
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_MAX_SCAN_INTERVAL,
     DEFAULT_NAME,
+    DEFAULT_READ_GAP,
+    DEFAULT_REPLAY_SPEED,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_UNIT_ID,
+    DEFAULT_WRITE_INTERVAL,
     DOMAIN,
+    STORAGE_VERSION,
 )
-from .hub import SAJModbusHub
-from .services import async_setup_services, async_unload_services
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,12 +45,59 @@ PLATFORMS = ["sensor", "number", "switch"]
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up a SAJ modbus entry from a config entry."""
+    started = time.monotonic()
+    # The hub, the transport and pymodbus are imported in the executor when
+    # the first entry is set up, not when Home Assistant loads the integration.
+    await async_import_module(hass, f"{__name__}.services")
+    from .hub import SAJModbusHub
+    from .recorder import FrameRecorder, load_frames
+    from .replay import ReplayConnection
+    from .services import async_setup_services
+
     host = entry.data[CONF_HOST]
     name = entry.data.get(CONF_NAME, DEFAULT_NAME)
     port = entry.data[CONF_PORT]
     scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
 
-    hub = SAJModbusHub(hass, name, host, port, scan_interval)
+    recorder = None
+    if entry.options.get(CONF_RECORD_FRAMES):
+        recorder = FrameRecorder(hass.config.path(f"{DOMAIN}_{slugify(name)}.frames"))
+        await hass.async_add_executor_job(recorder.open)
+
+    connection = None
+    if replay_file := entry.options.get(CONF_REPLAY_FILE):
+        frames = await hass.async_add_executor_job(
+            load_frames, hass.config.path(replay_file)
+        )
+        _LOGGER.warning(
+            "%s: replaying %s frames from %s", name, len(frames), replay_file
+        )
+        connection = ReplayConnection(
+            frames, entry.options.get(CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED)
+        )
+
+    hub = SAJModbusHub(
+        hass,
+        name,
+        host,
+        port,
+        scan_interval,
+        fast_scan_interval=entry.options.get(CONF_FAST_SCAN_INTERVAL),
+        slow_scan_interval=entry.options.get(CONF_SLOW_SCAN_INTERVAL),
+        max_scan_interval=entry.options.get(
+            CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+        ),
+        unit=entry.data.get(CONF_UNIT_ID, DEFAULT_UNIT_ID),
+        read_gap=entry.options.get(CONF_READ_GAP, DEFAULT_READ_GAP),
+        write_interval=entry.options.get(CONF_WRITE_INTERVAL, DEFAULT_WRITE_INTERVAL),
+        recorder=recorder,
+        connection=connection,
+        max_data_age=entry.options.get(CONF_MAX_DATA_AGE, DEFAULT_MAX_DATA_AGE),
+        store=Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"),
+        clock_sync_threshold=entry.options.get(
+            CONF_CLOCK_SYNC_THRESHOLD, DEFAULT_CLOCK_SYNC_THRESHOLD
+        ),
+    )
 
     entry.runtime_data = {
         "hub": hub,
@@ -40,30 +108,51 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         },
     }
 
-    try:
-        await hub.async_setup()
-        await hub.async_refresh()
-    except (UpdateFailed, ConfigEntryNotReady) as err:
-        raise ConfigEntryNotReady from err
+    if await hub.async_restore():
+        # The entities are set up from the cache, without waiting for an
+        # inverter that may be dark.
+        entry.async_create_background_task(
+            hass, hub.async_refresh(), f"{DOMAIN} {name} first refresh"
+        )
+    else:
+        try:
+            await hub.async_setup()
+            await hub.async_refresh()
+        except (UpdateFailed, ConfigEntryNotReady) as err:
+            await hub.async_close()
+            raise ConfigEntryNotReady from err
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.add_update_listener(options_update_listener)
 
     async_setup_services(hass)
 
+    _LOGGER.debug("%s: set up in %.3f s", name, time.monotonic() - started)
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    from .services import async_unload_services
+
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         if hub := entry.runtime_data.pop("hub", None):
-            hub.close()
-        async_unload_services(hass)
+            await hub.async_close()
+        # The services are shared by the inverters of every entry.
+        if not any(
+            other.entry_id != entry.entry_id
+            for other in hass.config_entries.async_loaded_entries(DOMAIN)
+        ):
+            async_unload_services(hass)
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cache of a config entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+
+
 async def options_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
     await hass.config_entries.async_reload(entry.entry_id)
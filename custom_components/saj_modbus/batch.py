@@ -0,0 +1,206 @@
+"""Batch decoding of recorded register frames into columns.
+
+Decodes many frames of one register block at once with NumPy: the register
+bytes of all frames are viewed as a structured array laid out like the
+block, so signed values and 32-bit word pairs come out of the dtype, and
+every scaled field is one vectorized division. The columns hold the values
+the hub decodes for each frame, with these representation differences:
+
+* the inverter clock is a naive datetime64[s] column, NaT when the
+  registers do not hold a valid date;
+* faultcodes and faultmessages are left out, the fault words and faultmsg
+  hold the same information.
+
+NumPy is imported on first use, it is not needed to run the integration.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from .const import DEVICE_STATUSSES
+from .faults import fault_values
+from .recorder import Frame
+from .registers import (
+    FAULT_WORD_KEYS,
+    KIND_BOOL,
+    KIND_DATETIME,
+    KIND_TEXT,
+    REALTIME_BLOCK,
+    RegisterBlock,
+    RegisterField,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _field_dtype(field: RegisterField) -> str | tuple[str, int]:
+    """Return the big-endian NumPy dtype of a field."""
+    if field.kind == KIND_TEXT:
+        return f"S{field.width * 2}"
+    if field.kind == KIND_DATETIME:
+        return (">u2", field.width)
+    if field.width == 2:
+        return ">i4" if field.signed else ">u4"
+    return ">i2" if field.signed and field.kind != KIND_BOOL else ">u2"
+
+
+def block_dtype(block: RegisterBlock) -> np.dtype:
+    """Return a structured dtype with the register layout of a block."""
+    import numpy as np
+
+    return np.dtype(
+        {
+            "names": [field.key for field in block.fields],
+            "formats": [_field_dtype(field) for field in block.fields],
+            "offsets": [(field.address - block.address) * 2 for field in block.fields],
+            "itemsize": block.count * 2,
+        }
+    )
+
+
+def _scaled(field: RegisterField, values: np.ndarray) -> np.ndarray:
+    """Scale a column of register values like the hub's decoder does.
+
+    round(value * 10**-p, p) is the double nearest to value / 10**p, so the
+    division gives the same floats without rounding every element.
+    """
+    import numpy as np
+
+    if field.precision is None and field.scale == 1:
+        return values.astype(np.int64)
+    if field.precision is not None and field.scale == 10.0**-field.precision:
+        return values / 10.0**field.precision
+    return np.array(
+        [round(value * field.scale, field.precision) for value in values.tolist()]
+    )
+
+
+def _clock(registers: np.ndarray) -> np.ndarray:
+    """Decode rows of the four clock registers into datetime64[s]."""
+    import numpy as np
+
+    registers = registers.astype(np.int64)
+    year = registers[:, 0]
+    month = registers[:, 1] >> 8
+    day = registers[:, 1] & 0xFF
+    hour = registers[:, 2] >> 8
+    minute = registers[:, 2] & 0xFF
+    second = registers[:, 3] >> 8
+
+    days_in_month = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    valid = (
+        (year >= 1)
+        & (month >= 1)
+        & (month <= 12)
+        & (day >= 1)
+        & (day <= days_in_month[np.clip(month, 0, 12)] + (leap & (month == 2)))
+        & (hour < 24)
+        & (minute < 60)
+        & (second < 60)
+    )
+    months = np.where(valid, (year - 1970) * 12 + month - 1, 0)
+    seconds = ((np.where(valid, day, 1) - 1) * 24 + hour) * 3600 + minute * 60 + second
+    clock = months.astype("datetime64[M]").astype("datetime64[s]") + np.where(
+        valid, seconds, 0
+    ).astype("timedelta64[s]")
+    clock[~valid] = np.datetime64("NaT")
+    return clock
+
+
+def decode_batch(
+    buffer: bytes | memoryview, block: RegisterBlock = REALTIME_BLOCK
+) -> dict[str, np.ndarray]:
+    """Decode the concatenated register bytes of frames of a block."""
+    import numpy as np
+
+    records = np.frombuffer(buffer, dtype=block_dtype(block))
+    columns: dict[str, np.ndarray] = {}
+    for field in block.fields:
+        values = records[field.key]
+        if field.kind == KIND_TEXT:
+            columns[field.key] = np.char.rstrip(
+                np.char.decode(values, "latin-1"), "\x00"
+            )
+        elif field.kind == KIND_DATETIME:
+            columns[field.key] = _clock(values)
+        elif field.kind == KIND_BOOL:
+            columns[field.key] = values == 1
+        else:
+            columns[field.key] = _scaled(field, values)
+
+    if "mpvmode" in columns:
+        modes = columns["mpvmode"]
+        statusses = np.array(
+            [
+                DEVICE_STATUSSES.get(mode, "Unknown")
+                for mode in range(modes.max(initial=0) + 1)
+            ]
+        )
+        columns["mpvstatus"] = statusses[modes]
+    if all(key in columns for key in FAULT_WORD_KEYS):
+        # Faults are rare: translate each distinct combination of the rows
+        # with a fault once.
+        words = np.stack([columns[key] for key in FAULT_WORD_KEYS], axis=1)
+        faulted = words.any(axis=1)
+        combinations, inverse = np.unique(words[faulted], axis=0, return_inverse=True)
+        messages = np.array(
+            [
+                fault_values(tuple(int(word) for word in combination))["faultmsg"]
+                for combination in combinations
+            ]
+            or [""]
+        )
+        columns["faultmsg"] = np.full(len(records), "", dtype=messages.dtype)
+        columns["faultmsg"][faulted] = messages[inverse.reshape(-1)]
+    return columns
+
+
+def decode_frames(
+    frames: Iterable[Frame],
+    block: RegisterBlock = REALTIME_BLOCK,
+    unit: int | None = None,
+) -> dict[str, np.ndarray]:
+    """Decode the recorded frames that hold a whole block, oldest first.
+
+    Adds the receive time of the frames as "timestamp" (unix time) and their
+    unit as "unit".
+    """
+    import numpy as np
+
+    size = block.count * 2
+    selected = [
+        frame
+        for frame in frames
+        if frame.address == block.address
+        and len(frame.raw) == size
+        and (unit is None or frame.unit == unit)
+    ]
+    columns = decode_batch(b"".join(frame.raw for frame in selected), block)
+    columns["timestamp"] = np.array([frame.timestamp for frame in selected])
+    columns["unit"] = np.array([frame.unit for frame in selected], dtype=np.uint8)
+    return columns
+
+
+def write_columns(path: str, columns: dict[str, Any]) -> str:
+    """Write columns to Parquet if pyarrow is available, else to NPZ.
+
+    Returns the path that was written, with the suffix of the format.
+    """
+    import numpy as np
+
+    try:
+        import pyarrow as pa
+        from pyarrow import parquet
+    except ImportError:
+        path = path if path.endswith(".npz") else f"{path}.npz"
+        np.savez_compressed(path, **columns)
+        return path
+    path = path if path.endswith(".parquet") else f"{path}.parquet"
+    parquet.write_table(
+        pa.table({key: pa.array(values) for key, values in columns.items()}), path
+    )
+    return path
@@ -0,0 +1,157 @@
+"""Short high-rate captures of realtime values.
+
+A capture polls a few realtime registers at its own interval, next to the
+regular polls, and keeps the samples in a preallocated ring buffer instead
+of the hub data, so no entity state is written. When it ends the samples
+are written to a CSV file or to a NumPy .npy file with one named float64
+column per value, in a single write.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import logging
+import math
+import struct
+import sys
+import time
+from array import array
+from collections.abc import Awaitable, Callable, Sequence
+
+from pymodbus.exceptions import ModbusException
+from pymodbus.pdu import ModbusPDU
+
+from .connection import PRIORITY_POLL
+from .planner import ReadRequest
+from .registers import KIND_NUMBER, REALTIME_BLOCK
+
+_LOGGER = logging.getLogger(__name__)
+
+FORMAT_CSV = "csv"
+FORMAT_BINARY = "binary"
+CAPTURE_FORMATS = (FORMAT_CSV, FORMAT_BINARY)
+CAPTURE_KEYS = tuple(
+    field.key for field in REALTIME_BLOCK.fields if field.kind == KIND_NUMBER
+)
+MAX_CAPTURE_SAMPLES = 86400
+
+
+class Capture:
+    """Sample realtime values into a ring buffer for a limited time."""
+
+    def __init__(
+        self,
+        read: Callable[[int, int, int, float], Awaitable[ModbusPDU]],
+        requests: Sequence[ReadRequest],
+        keys: Sequence[str],
+        interval: float,
+        duration: float | None = None,
+        samples: int | None = None,
+    ) -> None:
+        """Initialize the capture.
+
+        It stops after duration seconds or the given number of samples,
+        whichever comes first.
+        """
+        if duration is None and samples is None:
+            raise ValueError("A capture needs a duration or a number of samples")
+        self._read = read
+        self._requests = tuple(requests)
+        self.keys = tuple(keys)
+        self.interval = interval
+        self.duration = duration
+        self.capacity = min(
+            samples or MAX_CAPTURE_SAMPLES,
+            math.ceil(duration / interval) if duration else MAX_CAPTURE_SAMPLES,
+            MAX_CAPTURE_SAMPLES,
+        )
+        # One row per sample: the unix time, then the values in key order.
+        self._columns = len(self.keys) + 1
+        self._buffer = array("d", bytes(8 * self._columns * self.capacity))
+        self.samples = 0
+        self.missed = 0
+
+    async def async_run(self) -> None:
+        """Take samples until the duration or the number of samples is reached."""
+        loop = asyncio.get_running_loop()
+        start = next_sample = loop.time()
+        while self.samples < self.capacity and (
+            self.duration is None or loop.time() - start < self.duration
+        ):
+            # A sample that cannot be taken before the next one is due is lost.
+            deadline = time.monotonic() + self.interval
+            try:
+                values = await self._async_sample(deadline)
+            except ModbusException as ex:
+                self.missed += 1
+                _LOGGER.debug("Missed a capture sample: %s", ex)
+            else:
+                self._append(time.time(), values)
+            next_sample += self.interval
+            await asyncio.sleep(max(next_sample - loop.time(), 0))
+
+    async def _async_sample(self, deadline: float) -> dict[str, float]:
+        """Read the registers of one sample."""
+        values: dict[str, float] = {}
+        for request in self._requests:
+            response = await self._read(
+                request.address, request.count, PRIORITY_POLL, deadline
+            )
+            if response.isError():
+                raise ModbusException(
+                    f"Error reading {request.count} registers at {request.address:#06x}"
+                )
+            values.update(request.decoder.decode(response.raw))
+        return values
+
+    def _append(self, timestamp: float, values: dict[str, float]) -> None:
+        """Store a sample, overwriting the oldest one when the buffer is full."""
+        offset = self.samples % self.capacity * self._columns
+        self._buffer[offset] = timestamp
+        for index, key in enumerate(self.keys, offset + 1):
+            self._buffer[index] = values[key]
+        self.samples += 1
+
+    def _rows(self) -> array:
+        """Return the stored samples, oldest first."""
+        rows = min(self.samples, self.capacity) * self._columns
+        split = self.samples % self.capacity * self._columns
+        if self.samples <= self.capacity:
+            return self._buffer[:rows]
+        return self._buffer[split:] + self._buffer[:split]
+
+    def write(self, path: str, fmt: str = FORMAT_CSV) -> None:
+        """Write the samples to a file in one write."""
+        rows = self._rows()
+        if fmt == FORMAT_BINARY:
+            data = self._npy(rows)
+        else:
+            text = io.StringIO()
+            writer = csv.writer(text)
+            writer.writerow(("timestamp", *self.keys))
+            for offset in range(0, len(rows), self._columns):
+                writer.writerow(
+                    f"{value:.12g}" for value in rows[offset : offset + self._columns]
+                )
+            data = text.getvalue().encode()
+        with open(path, "wb") as file:
+            file.write(data)
+
+    def _npy(self, rows: array) -> bytes:
+        """Encode the samples as a .npy file of named float64 columns."""
+        endian = "<" if sys.byteorder == "little" else ">"
+        descr = [(name, f"{endian}f8") for name in ("timestamp", *self.keys)]
+        header = (
+            f"{{'descr': {descr}, 'fortran_order': False,"
+            f" 'shape': ({len(rows) // self._columns},), }}"
+        )
+        # The header is padded with spaces so the data starts 64-byte aligned.
+        header += " " * (-(len(header) + 11) % 64) + "\n"
+        return (
+            b"\x93NUMPY\x01\x00"
+            + struct.pack("<H", len(header))
+            + header.encode("latin-1")
+            + rows.tobytes()
+        )
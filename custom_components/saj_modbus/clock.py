@@ -0,0 +1,75 @@
+"""Drift of the inverter clock.
+
+The inverter rolls its daily energy and hour counters over at midnight on
+its own clock, so a clock that runs ahead or behind splits the day at the
+wrong time. The drift is the smoothed offset between the clock registers
+and the time they were read, and can be corrected by setting the clock.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+# Weight of a new sample in the smoothed drift. The clock registers count
+# whole seconds, smoothing averages out where in the second they are read.
+DRIFT_GAIN = 1 / 8
+# Samples of the drift before it is trusted to set the clock.
+MIN_SAMPLES = 4
+# Seconds between two automatic settings of the clock.
+SYNC_INTERVAL = 6 * 3600
+# The clock is not set this close to midnight, on the inverter's clock or
+# on the real one, so the daily counters roll over once.
+MIDNIGHT_MARGIN = timedelta(minutes=10)
+
+
+def _near_midnight(value: datetime) -> bool:
+    """Return True when a time is within the margin of midnight."""
+    since = value - value.replace(hour=0, minute=0, second=0, microsecond=0)
+    return since < MIDNIGHT_MARGIN or timedelta(days=1) - since < MIDNIGHT_MARGIN
+
+
+@dataclass(slots=True)
+class ClockDrift:
+    """Smoothed offset of the inverter clock, positive when it runs ahead.
+
+    The clock is due to be set once the drift exceeds threshold seconds,
+    with 0 leaving the clock alone.
+    """
+
+    threshold: float = 0.0
+    drift: float | None = None
+    samples: int = 0
+    last_sync: float | None = None
+    syncs: int = 0
+
+    def add(self, clock: datetime, read: datetime) -> None:
+        """Add the clock registers and the time at which they were read."""
+        # The registers hold the second that started, half a second earlier
+        # on average.
+        offset = (clock - read).total_seconds() + 0.5
+        if self.drift is None:
+            self.drift = offset
+        else:
+            self.drift += (offset - self.drift) * DRIFT_GAIN
+        self.samples += 1
+
+    def reset(self) -> None:
+        """Forget the drift after the clock was set."""
+        self.drift = None
+        self.samples = 0
+
+    def sync_due(self, clock: datetime, read: datetime, now: float) -> bool:
+        """Return True when the clock should be set at monotonic time now."""
+        if (
+            not self.threshold
+            or self.drift is None
+            or self.samples < MIN_SAMPLES
+            or abs(self.drift) < self.threshold
+        ):
+            return False
+        if self.last_sync is not None and now - self.last_sync < SYNC_INTERVAL:
+            return False
+        return not (
+            _near_midnight(clock) or _near_midnight(read.astimezone(clock.tzinfo))
+        )
@@ -15,7 +15,31 @@ from homeassistant.config_entries import (
 from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_SCAN_INTERVAL
 from homeassistant.core import callback
 
-from .const import DEFAULT_NAME, DEFAULT_PORT, DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import (
+    CONF_CLOCK_SYNC_THRESHOLD,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_MAX_DATA_AGE,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_READ_GAP,
+    CONF_RECORD_FRAMES,
+    CONF_REPLAY_FILE,
+    CONF_REPLAY_SPEED,
+    CONF_SLOW_SCAN_INTERVAL,
+    CONF_UNIT_ID,
+    CONF_WRITE_INTERVAL,
+    DEFAULT_CLOCK_SYNC_THRESHOLD,
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_NAME,
+    DEFAULT_PORT,
+    DEFAULT_READ_GAP,
+    DEFAULT_REPLAY_SPEED,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_UNIT_ID,
+    DEFAULT_WRITE_INTERVAL,
+    DOMAIN,
+    MAX_READ_COUNT,
+)
 
 
 def host_valid(host: str) -> bool:
@@ -45,11 +69,13 @@ class SAJModbusConfigFlow(ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
         if user_input is not None:
             host = user_input[CONF_HOST]
+            unit = user_input[CONF_UNIT_ID]
 
             if not host_valid(host):
                 errors[CONF_HOST] = "invalid_host"
             elif any(
                 entry.data.get(CONF_HOST) == host
+                and entry.data.get(CONF_UNIT_ID, DEFAULT_UNIT_ID) == unit
                 for entry in self._async_current_entries()
             ):
                 errors[CONF_HOST] = "already_configured"
@@ -58,11 +84,15 @@ class SAJModbusConfigFlow(ConfigFlow, domain=DOMAIN):
                     CONF_NAME: user_input[CONF_NAME],
                     CONF_HOST: user_input[CONF_HOST],
                     CONF_PORT: user_input[CONF_PORT],
+                    CONF_UNIT_ID: unit,
                 }
                 options = {
                     CONF_SCAN_INTERVAL: user_input[CONF_SCAN_INTERVAL],
                 }
-                await self.async_set_unique_id(host)
+                # Entries of the first unit keep the plain host as unique id.
+                await self.async_set_unique_id(
+                    host if unit == DEFAULT_UNIT_ID else f"{host}:{unit}"
+                )
                 self._abort_if_unique_id_configured()
                 return self.async_create_entry(
                     title=data[CONF_NAME], data=data, options=options
@@ -73,9 +103,10 @@ class SAJModbusConfigFlow(ConfigFlow, domain=DOMAIN):
                 vol.Optional(CONF_NAME, default=DEFAULT_NAME): str,
                 vol.Required(CONF_HOST): str,
                 vol.Required(CONF_PORT, default=DEFAULT_PORT): int,
-                vol.Optional(
-                    CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL
-                ): int,
+                vol.Required(CONF_UNIT_ID, default=DEFAULT_UNIT_ID): vol.All(
+                    int, vol.Range(min=1, max=247)
+                ),
+                vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): int,
             }
         )
 
@@ -102,10 +133,24 @@ class SAJModbusOptionsFlowHandler(OptionsFlow):
                 options={
                     **self.config_entry.options,
                     CONF_SCAN_INTERVAL: user_input[CONF_SCAN_INTERVAL],
+                    CONF_FAST_SCAN_INTERVAL: user_input[CONF_FAST_SCAN_INTERVAL],
+                    CONF_SLOW_SCAN_INTERVAL: user_input[CONF_SLOW_SCAN_INTERVAL],
+                    CONF_MAX_SCAN_INTERVAL: user_input[CONF_MAX_SCAN_INTERVAL],
+                    CONF_READ_GAP: user_input[CONF_READ_GAP],
+                    CONF_WRITE_INTERVAL: user_input[CONF_WRITE_INTERVAL],
+                    CONF_MAX_DATA_AGE: user_input[CONF_MAX_DATA_AGE],
+                    CONF_CLOCK_SYNC_THRESHOLD: user_input[CONF_CLOCK_SYNC_THRESHOLD],
+                    CONF_RECORD_FRAMES: user_input[CONF_RECORD_FRAMES],
+                    CONF_REPLAY_FILE: user_input.get(CONF_REPLAY_FILE, ""),
+                    CONF_REPLAY_SPEED: user_input[CONF_REPLAY_SPEED],
                 },
             )
             return self.async_abort(reason="reconfigure_successful")
 
+        scan_interval = self.config_entry.options.get(
+            CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+        )
+
         options_schema = vol.Schema(
             {
                 vol.Required(
@@ -114,12 +159,67 @@ class SAJModbusOptionsFlowHandler(OptionsFlow):
                 vol.Required(
                     CONF_PORT, default=self.config_entry.data.get(CONF_PORT)
                 ): int,
+                vol.Optional(CONF_SCAN_INTERVAL, default=scan_interval): int,
+                vol.Optional(
+                    CONF_FAST_SCAN_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_FAST_SCAN_INTERVAL, scan_interval
+                    ),
+                ): int,
+                vol.Optional(
+                    CONF_SLOW_SCAN_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_SLOW_SCAN_INTERVAL, scan_interval
+                    ),
+                ): int,
                 vol.Optional(
-                    CONF_SCAN_INTERVAL,
+                    CONF_MAX_SCAN_INTERVAL,
                     default=self.config_entry.options.get(
-                        CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+                        CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
                     ),
                 ): int,
+                vol.Optional(
+                    CONF_READ_GAP,
+                    default=self.config_entry.options.get(
+                        CONF_READ_GAP, DEFAULT_READ_GAP
+                    ),
+                ): vol.All(int, vol.Range(min=0, max=MAX_READ_COUNT)),
+                vol.Optional(
+                    CONF_WRITE_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_WRITE_INTERVAL, DEFAULT_WRITE_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_MAX_DATA_AGE,
+                    default=self.config_entry.options.get(
+                        CONF_MAX_DATA_AGE, DEFAULT_MAX_DATA_AGE
+                    ),
+                ): vol.All(int, vol.Range(min=0)),
+                vol.Optional(
+                    CONF_CLOCK_SYNC_THRESHOLD,
+                    default=self.config_entry.options.get(
+                        CONF_CLOCK_SYNC_THRESHOLD, DEFAULT_CLOCK_SYNC_THRESHOLD
+                    ),
+                ): vol.All(int, vol.Range(min=0)),
+                vol.Optional(
+                    CONF_RECORD_FRAMES,
+                    default=self.config_entry.options.get(CONF_RECORD_FRAMES, False),
+                ): bool,
+                vol.Optional(
+                    CONF_REPLAY_FILE,
+                    description={
+                        "suggested_value": self.config_entry.options.get(
+                            CONF_REPLAY_FILE
+                        )
+                    },
+                ): str,
+                vol.Optional(
+                    CONF_REPLAY_SPEED,
+                    default=self.config_entry.options.get(
+                        CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
             }
         )
 
@@ -0,0 +1,562 @@
+"""Persistent Modbus TCP connection for SAJ inverters."""
+
+import asyncio
+import logging
+import random
+import socket
+import struct
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+
+from homeassistant.core import HomeAssistant
+
+from pymodbus.client import AsyncModbusTcpClient
+from pymodbus.exceptions import (
+    ConnectionException,
+    ModbusException,
+    ModbusIOException,
+)
+from pymodbus.pdu import ModbusPDU
+from pymodbus.pdu.register_message import ReadHoldingRegistersResponse
+
+from .const import DOMAIN
+from .instrumentation import Instrumentation
+
+_LOGGER = logging.getLogger(__name__)
+
+RECONNECT_DELAY_MIN = 1.0
+RECONNECT_DELAY_MAX = 300.0
+KEEPALIVE_IDLE = 30
+KEEPALIVE_INTERVAL = 10
+KEEPALIVE_COUNT = 3
+# RS485 gateways need a quiet gap before a frame to another inverter than
+# the one they last talked to.
+FRAME_DELAY = 0.05
+# Bytes on the wire: MBAP header (7) plus the PDU of each frame.
+READ_REQUEST_SIZE = 12
+WRITE_RESPONSE_SIZE = 12
+EXCEPTION_RESPONSE_SIZE = 9
+# Bounds of the response timeout, which follows the measured round-trip time.
+TIMEOUT_MIN = 1.0
+TIMEOUT_MAX = 5.0
+# Gains of the smoothed round-trip time and its mean deviation (RFC 6298).
+RTT_GAIN = 1 / 8
+RTT_VARIATION_GAIN = 1 / 4
+# Reads are retried this often when they time out or the gateway could not
+# reach the inverter; the socket is dropped after this many timeouts in a row.
+READ_RETRIES = 2
+SILENT_TIMEOUTS = 2
+# Modbus exception codes: gateway path unavailable, gateway target device
+# failed to respond. Numeric, pymodbus renamed its constants in 3.11.
+GATEWAY_ERRORS = frozenset({0x0A, 0x0B})
+
+# Request classes, served in this order: control writes, reads somebody is
+# waiting for (setup, write confirmations) and the scheduled polls.
+PRIORITY_CONTROL = 0
+PRIORITY_REQUEST = 1
+PRIORITY_POLL = 2
+PRIORITY_NAMES = ("control", "request", "poll")
+
+
+class RequestExpired(ModbusException):
+    """A queued request passed its deadline before it was sent."""
+
+
+@dataclass(slots=True)
+class QueueStats:
+    """Queueing delay of the requests of one priority class."""
+
+    requests: int = 0
+    expired: int = 0
+    total_delay: float = 0.0
+    max_delay: float = 0.0
+
+    def add(self, delay: float) -> None:
+        """Record the queueing delay of a request."""
+        self.requests += 1
+        self.total_delay += delay
+        self.max_delay = max(self.max_delay, delay)
+
+    @property
+    def mean_delay(self) -> float:
+        """Return the mean queueing delay in seconds."""
+        return self.total_delay / self.requests if self.requests else 0.0
+
+
+class RawReadHoldingRegistersResponse(ReadHoldingRegistersResponse):
+    """Read holding registers response that keeps the register bytes.
+
+    The stock response unpacks every register into a list of ints. This one
+    keeps a memoryview on the payload so the register map can unpack it in
+    one go; the list is only built when something asks for ``registers``.
+    """
+
+    raw: memoryview = memoryview(b"")
+    _registers: list[int] | None = None
+
+    @property
+    def registers(self) -> list[int]:
+        """Return the register values."""
+        if self._registers is None:
+            self._registers = list(struct.unpack(f">{len(self.raw) // 2}H", self.raw))
+        return self._registers
+
+    @registers.setter
+    def registers(self, value: list[int]) -> None:
+        """Set the register values."""
+        self._registers = value
+
+    def decode(self, data: bytes) -> None:
+        """Keep a view on the register bytes of the response."""
+        if (byte_count := int(data[0])) >= len(data):
+            raise ModbusIOException(
+                f"byte_count {byte_count} > length of packet {len(data)}"
+            )
+        self.raw = memoryview(data)[1 : 1 + byte_count]
+        self._registers = None
+
+    def __str__(self) -> str:
+        """Build a representation without unpacking the registers."""
+        return (
+            f"{self.__class__.__name__}(dev_id={self.dev_id}, "
+            f"transaction_id={self.transaction_id}, byte_count={len(self.raw)})"
+        )
+
+
+@dataclass(slots=True)
+class RoundTripTime:
+    """Smoothed round-trip time of the requests to one unit.
+
+    The response timeout is derived like TCP does: the smoothed round-trip
+    time plus four times its mean deviation, within the bounds, and doubled
+    after every timeout until a response comes in again.
+    """
+
+    min_timeout: float = TIMEOUT_MIN
+    max_timeout: float = TIMEOUT_MAX
+    smoothed: float | None = None
+    variation: float = 0.0
+    backoff: int = 1
+    timeouts: int = 0
+    retries: int = 0
+
+    def add(self, rtt: float) -> None:
+        """Record the round-trip time of an answered request."""
+        if self.smoothed is None:
+            self.smoothed = rtt
+            self.variation = rtt / 2
+        else:
+            self.variation += RTT_VARIATION_GAIN * (
+                abs(self.smoothed - rtt) - self.variation
+            )
+            self.smoothed += RTT_GAIN * (rtt - self.smoothed)
+        self.backoff = 1
+
+    def add_timeout(self) -> None:
+        """Record a request that was not answered in time."""
+        self.timeouts += 1
+        if self.timeout < self.max_timeout:
+            self.backoff *= 2
+
+    @property
+    def timeout(self) -> float:
+        """Return the response timeout for the next request in seconds."""
+        if self.smoothed is None:
+            return self.max_timeout
+        timeout = max(self.smoothed + 4 * self.variation, self.min_timeout)
+        return min(timeout * self.backoff, self.max_timeout)
+
+
+@dataclass(slots=True)
+class _Waiter:
+    """A request waiting for its turn on the bus."""
+
+    future: asyncio.Future[None]
+    deadline: float | None
+
+
+class SAJModbusConnection:
+    """Modbus TCP connection that stays open across polls.
+
+    The WiFi/Ethernet dongles are slow to accept connections and sometimes
+    refuse them, so the socket is kept open and only re-established when it
+    is lost, with exponential backoff and jitter between attempts.
+
+    One connection is shared by all inverters behind the same gateway. Their
+    transactions are served by priority class and take turns round robin
+    per unit ID within a class, with a quiet gap of frame_delay seconds
+    before a frame to another unit than the previous one; a gateway with a
+    single inverter behind it gets no gap. Requests that are still queued
+    at their deadline are dropped with RequestExpired.
+
+    The response timeout of each unit follows its measured round-trip time
+    between min_timeout and timeout, the latter is also the timeout for
+    connecting. pymodbus does not retry, the connection retries reads itself
+    within the deadline of the caller.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        timeout: float = TIMEOUT_MAX,
+        frame_delay: float = FRAME_DELAY,
+        min_timeout: float = TIMEOUT_MIN,
+    ) -> None:
+        """Initialize the connection."""
+        self._client = AsyncModbusTcpClient(
+            host=host, port=port, timeout=timeout, retries=0, reconnect_delay=0
+        )
+        self._client.register(RawReadHoldingRegistersResponse)
+        self._timeout = timeout
+        self._min_timeout = min(min_timeout, timeout)
+        self.round_trips: dict[int, RoundTripTime] = {}
+        self._silent = 0
+        self._frame_delay = frame_delay
+        self._last_frame = 0.0
+        self._last_unit: int | None = None
+        self._busy = False
+        self._waiters: tuple[dict[int, deque[_Waiter]], ...] = tuple(
+            {} for _ in PRIORITY_NAMES
+        )
+        self._turns: tuple[deque[int], ...] = tuple(deque() for _ in PRIORITY_NAMES)
+        self.queue_stats = tuple(QueueStats() for _ in PRIORITY_NAMES)
+        self.units: set[int] = set()
+        self.instruments: dict[int, Instrumentation] = {}
+        self._delay = 0.0
+        self._next_attempt = 0.0
+        self._connected_since: float | None = None
+        self._has_connected = False
+        self.reconnects = 0
+        self.connect_failures = 0
+
+    def __str__(self) -> str:
+        """Return the address of the connection."""
+        return f"{self._client.comm_params.host}:{self._client.comm_params.port}"
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the socket is open."""
+        return self._client.connected
+
+    @property
+    def connection_age(self) -> float | None:
+        """Return the number of seconds the current socket has been open."""
+        if self._connected_since is None or not self._client.connected:
+            return None
+        return time.monotonic() - self._connected_since
+
+    def poll_offset(self, unit: int, interval: float) -> float:
+        """Return the offset of a unit's polls within the polling interval.
+
+        The units on the gateway get evenly spaced slots, so their polls do
+        not all hit the bus at the same moment.
+        """
+        if unit not in self.units:
+            return 0.0
+        units = sorted(self.units)
+        return interval * units.index(unit) / len(units)
+
+    def close(self) -> None:
+        """Close the socket."""
+        self._client.close()
+        self._connected_since = None
+
+    async def async_close(self) -> None:
+        """Close the socket once the pending transaction is done."""
+        async with self._async_turn(-1, PRIORITY_CONTROL):
+            self.close()
+
+    async def async_read_holding_registers(
+        self,
+        unit: int,
+        address: int,
+        count: int,
+        priority: int = PRIORITY_REQUEST,
+        deadline: float | None = None,
+        retries: int = READ_RETRIES,
+    ) -> ModbusPDU:
+        """Read holding registers.
+
+        Reads have no side effects, so one that times out or that the gateway
+        could not deliver is sent again, up to retries times and only while
+        the answer can still arrive before the deadline. Successful responses
+        carry the register bytes in ``raw``.
+        """
+        kind = f"read {address:#06x}+{count}"
+        attempt = 0
+        while True:
+            try:
+                response = await self._async_execute(
+                    self._client.read_holding_registers,
+                    unit,
+                    priority,
+                    deadline,
+                    (kind, READ_REQUEST_SIZE, 9 + count * 2),
+                    address=address,
+                    count=count,
+                    device_id=unit,
+                )
+            except ModbusIOException:
+                if not self._may_retry(unit, kind, attempt, retries, deadline):
+                    raise
+            else:
+                if (
+                    not response.isError()
+                    or response.exception_code not in GATEWAY_ERRORS
+                    or not self._may_retry(unit, kind, attempt, retries, deadline)
+                ):
+                    return response
+            attempt += 1
+
+    async def async_write_registers(
+        self, unit: int, address: int, values: list[int]
+    ) -> ModbusPDU:
+        """Write registers."""
+        return await self._async_execute(
+            self._client.write_registers,
+            unit,
+            PRIORITY_CONTROL,
+            None,
+            (f"write {address:#06x}", 13 + len(values) * 2, WRITE_RESPONSE_SIZE),
+            address=address,
+            values=values,
+            device_id=unit,
+        )
+
+    async def _async_execute(
+        self,
+        request: Callable[..., Awaitable[ModbusPDU]],
+        unit: int,
+        priority: int,
+        deadline: float | None,
+        frame: tuple[str, int, int],
+        **kwargs,
+    ) -> ModbusPDU:
+        """Run a single transaction on the open socket.
+
+        The response timeout follows the round-trip time of the unit. frame
+        holds the kind of request and the sizes of the request and response
+        frames, for the instrumentation of the unit.
+        """
+        async with self._async_turn(unit, priority, deadline):
+            await self._async_connect()
+            round_trip = self._round_trip(unit)
+            self._client.ctx.comm_params.timeout_connect = round_trip.timeout
+            instrument = self.instruments.get(unit)
+            kind, sent, received = frame
+            start = time.monotonic()
+            try:
+                response = await request(**kwargs)
+            except ModbusIOException as exc:
+                if isinstance(exc.__cause__, asyncio.CancelledError):
+                    # pymodbus turns a cancellation from outside into an I/O
+                    # error, it is neither a timeout nor worth a retry.
+                    raise exc.__cause__ from None
+                round_trip.add_timeout()
+                if instrument is not None:
+                    instrument.add_failure(kind, sent, timeout=True)
+                self._drop_silent()
+                raise
+            except ModbusException:
+                if instrument is not None:
+                    instrument.add_failure(kind, sent, timeout=False)
+                raise
+            latency = time.monotonic() - start
+            self._silent = 0
+            error = response.isError()
+            if not error:
+                # Error responses of a gateway come after its own timeout.
+                round_trip.add(latency)
+            if instrument is not None:
+                instrument.add_response(
+                    kind,
+                    latency,
+                    sent,
+                    EXCEPTION_RESPONSE_SIZE if error else received,
+                    error,
+                )
+            return response
+
+    def _round_trip(self, unit: int) -> RoundTripTime:
+        """Return the round-trip time of a unit."""
+        if (round_trip := self.round_trips.get(unit)) is None:
+            round_trip = self.round_trips[unit] = RoundTripTime(
+                self._min_timeout, self._timeout
+            )
+        return round_trip
+
+    def _may_retry(
+        self,
+        unit: int,
+        kind: str,
+        attempt: int,
+        retries: int,
+        deadline: float | None,
+    ) -> bool:
+        """Return True, and count the retry, if a failed read is sent again."""
+        round_trip = self._round_trip(unit)
+        if attempt >= retries or (
+            deadline is not None
+            and time.monotonic() + self._frame_delay + round_trip.timeout > deadline
+        ):
+            return False
+        round_trip.retries += 1
+        if (instrument := self.instruments.get(unit)) is not None:
+            instrument.add_retry(kind)
+        _LOGGER.debug("Retrying %s of unit %s on %s", kind, unit, self)
+        return True
+
+    def _drop_silent(self) -> None:
+        """Drop a connection that did not answer several requests in a row."""
+        # A single lost frame is retried on the same socket, pymodbus skips a
+        # late answer by its transaction ID. No responses at all on an open
+        # socket: treat it as half-open, the dongle often drops the TCP
+        # session without sending a FIN.
+        self._silent += 1
+        if self._silent < SILENT_TIMEOUTS:
+            return
+        _LOGGER.debug("No response from %s, dropping the connection", self)
+        self._silent = 0
+        self.close()
+
+    @asynccontextmanager
+    async def _async_turn(
+        self, unit: int, priority: int, deadline: float | None = None
+    ) -> AsyncIterator[None]:
+        """Wait for the turn of a unit on the bus.
+
+        Higher priority classes go first. Within a class, waiting units are
+        served round robin, one transaction each, so an inverter with a long
+        read plan cannot starve the others.
+        """
+        queued = time.monotonic()
+        if deadline is not None and deadline < queued:
+            self.queue_stats[priority].expired += 1
+            raise RequestExpired(f"Request to unit {unit} expired before it was queued")
+        if self._busy:
+            waiter = _Waiter(asyncio.get_running_loop().create_future(), deadline)
+            queue = self._waiters[priority].setdefault(unit, deque())
+            if not queue:
+                self._turns[priority].append(unit)
+            queue.append(waiter)
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                # Cancelled waiters are skipped by _release, but a turn that
+                # was already handed over has to be passed on. One that expired
+                # in the queue was never handed over.
+                if not waiter.future.cancelled() and waiter.future.exception() is None:
+                    self._release()
+                raise
+            except RequestExpired:
+                self.queue_stats[priority].expired += 1
+                raise
+        else:
+            self._busy = True
+        self.queue_stats[priority].add(time.monotonic() - queued)
+        try:
+            if unit != self._last_unit and len(self.units) > 1:
+                delay = self._last_frame + self._frame_delay - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield
+        finally:
+            self._last_frame = time.monotonic()
+            self._last_unit = unit
+            self._release()
+
+    def _release(self) -> None:
+        """Hand the bus to the next waiting request."""
+        now = time.monotonic()
+        for waiters, turns in zip(self._waiters, self._turns):
+            while turns:
+                unit = turns.popleft()
+                queue = waiters[unit]
+                waiter = queue.popleft()
+                if queue:
+                    turns.append(unit)
+                if waiter.future.done():
+                    continue
+                if waiter.deadline is not None and waiter.deadline < now:
+                    waiter.future.set_exception(
+                        RequestExpired(f"Request to unit {unit} expired in the queue")
+                    )
+                    continue
+                waiter.future.set_result(None)
+                return
+        self._busy = False
+
+    async def _async_connect(self) -> None:
+        """Open the socket if needed, honouring the reconnect backoff."""
+        if self._client.connected:
+            return
+        now = time.monotonic()
+        if now < self._next_attempt:
+            raise ConnectionException(
+                f"Waiting {self._next_attempt - now:.1f}s before reconnecting to {self}"
+            )
+        self._client.ctx.comm_params.timeout_connect = self._timeout
+        if not await self._client.connect():
+            self.connect_failures += 1
+            self._delay = min(
+                max(self._delay * 2, RECONNECT_DELAY_MIN), RECONNECT_DELAY_MAX
+            )
+            self._next_attempt = time.monotonic() + random.uniform(
+                self._delay / 2, self._delay
+            )
+            raise ConnectionException(f"Failed to connect to {self}")
+
+        if self._has_connected:
+            self.reconnects += 1
+        self._has_connected = True
+        self._delay = 0.0
+        self._next_attempt = 0.0
+        self._connected_since = time.monotonic()
+        self._enable_keepalive()
+        _LOGGER.debug("Connected to %s", self)
+
+    def _enable_keepalive(self) -> None:
+        """Let the kernel probe idle sockets so half-open ones get closed."""
+        transport = self._client.ctx.transport
+        if transport is None or (sock := transport.get_extra_info("socket")) is None:
+            return
+        with suppress(OSError):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            for option, value in (
+                ("TCP_KEEPIDLE", KEEPALIVE_IDLE),
+                ("TCP_KEEPINTVL", KEEPALIVE_INTERVAL),
+                ("TCP_KEEPCNT", KEEPALIVE_COUNT),
+            ):
+                if hasattr(socket, option):
+                    sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+
+
+def async_get_connection(
+    hass: HomeAssistant, host: str, port: int, unit: int
+) -> SAJModbusConnection:
+    """Return the connection to a gateway, shared by all its inverters."""
+    connections: dict[tuple[str, int], SAJModbusConnection] = hass.data.setdefault(
+        DOMAIN, {}
+    )
+    if (connection := connections.get((host, port))) is None:
+        connection = connections[(host, port)] = SAJModbusConnection(host, port)
+    connection.units.add(unit)
+    return connection
+
+
+async def async_release_connection(
+    hass: HomeAssistant, connection: SAJModbusConnection, unit: int
+) -> None:
+    """Detach an inverter and close the connection when it was the last one."""
+    connection.units.discard(unit)
+    if connection.units:
+        return
+    connections: dict[tuple[str, int], SAJModbusConnection] = hass.data.get(DOMAIN, {})
+    for key, value in list(connections.items()):
+        if value is connection:
+            del connections[key]
+    await connection.async_close()
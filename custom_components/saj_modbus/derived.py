@@ -0,0 +1,100 @@
+"""Metrics derived from the realtime values of an inverter.
+
+The hub computes them on every poll from the values it just read, in
+constant time: the DC input power of the strings, the conversion
+efficiency, the imbalance of the phase currents and the energy of every
+string on the current day. The energy is integrated with the trapezoidal
+rule on the inverter clock, and rolls over at midnight on that clock like
+the inverter's own daily counters.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any
+
+STRING_POWER_KEYS = ("pv1power", "pv2power", "pv3power")
+STRING_ENERGY_KEYS = ("pv1energy", "pv2energy", "pv3energy")
+PHASE_CURRENT_KEYS = ("l1curr", "l2curr", "l3curr")
+
+# DC power in W below which the efficiency is not computed, the inverter's
+# own consumption dominates it.
+MIN_EFFICIENCY_POWER = 100
+# Mean phase current in A below which the imbalance is not computed.
+MIN_IMBALANCE_CURRENT = 0.5
+# Seconds between two reads of a string beyond which the power in between
+# is unknown and not integrated.
+MAX_INTEGRATION_GAP = 900
+
+
+class DerivedMetrics:
+    """Compute the derived metrics and integrate the string energies."""
+
+    __slots__ = ("_day", "_energy", "_last")
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self._day: date | None = None
+        # Energy of every string on the current day, in Wh.
+        self._energy = [0.0] * len(STRING_POWER_KEYS)
+        # Inverter time in seconds and power of the last read of every string.
+        self._last: list[tuple[float, int] | None] = [None] * len(STRING_POWER_KEYS)
+
+    def add_power(self, values: dict[str, Any], clock: datetime) -> None:
+        """Integrate the string powers of a read up to its inverter time."""
+        if (day := clock.date()) != self._day:
+            self._day = day
+            self._energy = [0.0] * len(STRING_POWER_KEYS)
+        seconds = clock.timestamp()
+        for index, key in enumerate(STRING_POWER_KEYS):
+            if (power := values.get(key)) is None:
+                continue
+            if (last := self._last[index]) is not None and (
+                0 < (elapsed := seconds - last[0]) <= MAX_INTEGRATION_GAP
+            ):
+                self._energy[index] += (last[1] + power) * elapsed / 7200
+            self._last[index] = (seconds, power)
+
+    def values(self, data: dict[str, Any]) -> dict[str, float | None]:
+        """Return the metrics for the current data.
+
+        The efficiency and imbalance are None while the power or current is
+        too low for them to mean anything; the imbalance also on single
+        phase inverters, which report no current on two phases.
+        """
+        derived: dict[str, float | None] = {}
+        powers = [data.get(key) for key in STRING_POWER_KEYS]
+        if None not in powers:
+            dc_power = derived["dcpower"] = sum(powers)
+            if (power := data.get("power")) is not None:
+                derived["efficiency"] = (
+                    round(power / dc_power * 100, 1)
+                    if dc_power >= MIN_EFFICIENCY_POWER
+                    else None
+                )
+        currents = [data.get(key) for key in PHASE_CURRENT_KEYS]
+        if None not in currents:
+            mean = sum(currents) / len(currents)
+            derived["phaseimbalance"] = (
+                round(max(abs(current - mean) for current in currents) / mean * 100, 1)
+                if mean >= MIN_IMBALANCE_CURRENT and min(currents) > 0
+                else None
+            )
+        for key, energy, last in zip(STRING_ENERGY_KEYS, self._energy, self._last):
+            if last is not None:
+                derived[key] = round(energy / 1000, 3)
+        return derived
+
+    def state(self) -> dict[str, Any]:
+        """Return the integration state for the cache."""
+        return {
+            "day": self._day and self._day.isoformat(),
+            "energy": self._energy,
+            "last": self._last,
+        }
+
+    def restore(self, state: dict[str, Any]) -> None:
+        """Continue the integration from a cached state."""
+        self._day = state["day"] and date.fromisoformat(state["day"])
+        self._energy = list(state["energy"])
+        self._last = [last and (last[0], last[1]) for last in state["last"]]
@@ -0,0 +1,644 @@
+"""Entity descriptions of the SAJ R5 Inverter Modbus entities.
+
+Imported by the entity platforms, so the sensor, number and switch
+components and the description tables are only loaded once entities are
+set up.
+"""
+
+from dataclasses import dataclass
+
+from homeassistant.components.number import NumberEntityDescription
+from homeassistant.components.switch import SwitchEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorStateClass,
+    SensorEntityDescription,
+)
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfReactivePower,
+    UnitOfElectricCurrent,
+    UnitOfElectricPotential,
+    UnitOfEnergy,
+    UnitOfFrequency,
+    UnitOfPower,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+
+
+@dataclass
+class SajModbusNumberEntityDescription(NumberEntityDescription):
+    """A class that describes SAJ number entities."""
+
+
+NUMBER_TYPES: dict[str, list[SajModbusNumberEntityDescription]] = {
+    "LimitPower": SajModbusNumberEntityDescription(
+        name="Limit Power",
+        native_max_value=110,
+        native_min_value=0,
+        key="limitpower",
+        icon="mdi:solar-power",
+        native_unit_of_measurement="%",
+    )
+}
+
+
+@dataclass
+class SajModbusSwitchEntityDescription(SwitchEntityDescription):
+    """A class that describes SAJ switch entities."""
+
+
+SWITCH_TYPES: dict[str, list[SajModbusSwitchEntityDescription]] = {
+    "PowerOnOff": SajModbusSwitchEntityDescription(
+        name="Power On Off",
+        key="poweronoff",
+        icon="mdi:power",
+        entity_registry_enabled_default=False,
+    )
+}
+
+
+@dataclass
+class SajModbusSensorEntityDescription(SensorEntityDescription):
+    """A class that describes SAJ sensor entities."""
+
+    attribute_keys: tuple[str, ...] = ()
+
+
+COUNTER_SENSOR_TYPES: dict[str, list[SajModbusSensorEntityDescription]] = {
+    "TodayEnergy": SajModbusSensorEntityDescription(
+        name="Power generation on current day",
+        key="todayenergy",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    "MonthEnergy": SajModbusSensorEntityDescription(
+        name="Power generation in current month",
+        key="monthenergy",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+    ),
+    "YearEnergy": SajModbusSensorEntityDescription(
+        name="Power generation in current year",
+        key="yearenergy",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+    ),
+    "TotalEnergy": SajModbusSensorEntityDescription(
+        name="Total power generation",
+        key="totalenergy",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    "TodayHour": SajModbusSensorEntityDescription(
+        name="Daily working hours",
+        key="todayhour",
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        icon="mdi:progress-clock",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    "TotalHour": SajModbusSensorEntityDescription(
+        name="Total working hours",
+        key="totalhour",
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        icon="mdi:progress-clock",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+}
+
+SENSOR_TYPES: dict[str, list[SajModbusSensorEntityDescription]] = {
+    "DevType": SajModbusSensorEntityDescription(
+        name="Device Type",
+        key="devtype",
+        icon="mdi:information-outline",
+        entity_registry_enabled_default=False,
+    ),
+    "SubType": SajModbusSensorEntityDescription(
+        name="Sub Type",
+        key="subtype",
+        icon="mdi:information-outline",
+        entity_registry_enabled_default=False,
+    ),
+    "CommVer": SajModbusSensorEntityDescription(
+        name="Comms Protocol Version",
+        key="commver",
+        icon="mdi:information-outline",
+        entity_registry_enabled_default=False,
+    ),
+    "SN": SajModbusSensorEntityDescription(
+        name="Serial Number",
+        key="sn",
+        icon="mdi:information-outline",
+        entity_registry_enabled_default=False,
+    ),
+    "PC": SajModbusSensorEntityDescription(
+        name="Product Code",
+        key="pc",
+        icon="mdi:information-outline",
+        entity_registry_enabled_default=False,
+    ),
+    "DV": SajModbusSensorEntityDescription(
+        name="Display Software Version",
+        key="dv",
+        icon="mdi:information-outline",
+        entity_registry_enabled_default=False,
+    ),
+    "MCV": SajModbusSensorEntityDescription(
+        name="Master Ctrl Software Version",
+        key="mcv",
+        icon="mdi:information-outline",
+        entity_registry_enabled_default=False,
+    ),
+    "SCV": SajModbusSensorEntityDescription(
+        name="Slave Ctrl Software Version",
+        key="scv",
+        icon="mdi:information-outline",
+        entity_registry_enabled_default=False,
+    ),
+    "DispHWVersion": SajModbusSensorEntityDescription(
+        name="Display Board Hardware Version",
+        key="disphwversion",
+        icon="mdi:information-outline",
+        entity_registry_enabled_default=False,
+    ),
+    "CtrlHWVersion": SajModbusSensorEntityDescription(
+        name="Control Board Hardware Version",
+        key="ctrlhwversion",
+        icon="mdi:information-outline",
+        entity_registry_enabled_default=False,
+    ),
+    "PowerHWVersion": SajModbusSensorEntityDescription(
+        name="Power Board Hardware Version",
+        key="powerhwversion",
+        icon="mdi:information-outline",
+        entity_registry_enabled_default=False,
+    ),
+    "MPVStatus": SajModbusSensorEntityDescription(
+        name="Inverter status",
+        key="mpvstatus",
+        icon="mdi:information-outline",
+    ),
+    "MPVMode": SajModbusSensorEntityDescription(
+        name="Inverter working mode",
+        key="mpvmode",
+        icon="mdi:information-outline",
+    ),
+    "FaultMSG": SajModbusSensorEntityDescription(
+        name="Inverter error message",
+        key="faultmsg",
+        icon="mdi:message-alert-outline",
+        attribute_keys=("faultcodes", "faultmessages"),
+    ),
+    "DateTime": SajModbusSensorEntityDescription(
+        name="Inverter date and time",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        key="datetime",
+        icon="mdi:clock-outline",
+        entity_registry_enabled_default=False,
+    ),
+    "ClockDrift": SajModbusSensorEntityDescription(
+        name="Inverter clock drift",
+        key="clockdrift",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:clock-alert-outline",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "PV1Volt": SajModbusSensorEntityDescription(
+        name="PV1 voltage",
+        key="pv1volt",
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        device_class=SensorDeviceClass.VOLTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "PV1Curr": SajModbusSensorEntityDescription(
+        name="PV1 total current",
+        key="pv1curr",
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        icon="mdi:current-ac",
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "PV1Power": SajModbusSensorEntityDescription(
+        name="PV1 power",
+        key="pv1power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    "PV2Volt": SajModbusSensorEntityDescription(
+        name="PV2 voltage",
+        key="pv2volt",
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        device_class=SensorDeviceClass.VOLTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "PV2Curr": SajModbusSensorEntityDescription(
+        name="PV2 total current",
+        key="pv2curr",
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        icon="mdi:current-ac",
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "PV2Power": SajModbusSensorEntityDescription(
+        name="PV2 power",
+        key="pv2power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    "PV3Volt": SajModbusSensorEntityDescription(
+        name="PV3 voltage",
+        key="pv3volt",
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        device_class=SensorDeviceClass.VOLTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "PV3Curr": SajModbusSensorEntityDescription(
+        name="PV3 total current",
+        key="pv3curr",
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        icon="mdi:current-ac",
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "PV3Power": SajModbusSensorEntityDescription(
+        name="PV3 power",
+        key="pv3power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "BusVolt": SajModbusSensorEntityDescription(
+        name="BUS voltage",
+        key="busvolt",
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        device_class=SensorDeviceClass.VOLTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "InvTempC": SajModbusSensorEntityDescription(
+        name="Inverter temperature",
+        key="invtempc",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "GFCI": SajModbusSensorEntityDescription(
+        name="GFCI",
+        key="gfci",
+        native_unit_of_measurement=UnitOfElectricCurrent.MILLIAMPERE,
+        icon="mdi:current-dc",
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "Power": SajModbusSensorEntityDescription(
+        name="Active power of inverter total output",
+        key="power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    "DCPower": SajModbusSensorEntityDescription(
+        name="Total DC input power",
+        key="dcpower",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    "Efficiency": SajModbusSensorEntityDescription(
+        name="Conversion efficiency",
+        key="efficiency",
+        native_unit_of_measurement=PERCENTAGE,
+        icon="mdi:transmission-tower-import",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "PV1Energy": SajModbusSensorEntityDescription(
+        name="PV1 energy on current day",
+        key="pv1energy",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+    ),
+    "PV2Energy": SajModbusSensorEntityDescription(
+        name="PV2 energy on current day",
+        key="pv2energy",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+    ),
+    "PV3Energy": SajModbusSensorEntityDescription(
+        name="PV3 energy on current day",
+        key="pv3energy",
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+    ),
+    "PhaseImbalance": SajModbusSensorEntityDescription(
+        name="Phase current imbalance",
+        key="phaseimbalance",
+        native_unit_of_measurement=PERCENTAGE,
+        icon="mdi:scale-unbalanced",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "QPower": SajModbusSensorEntityDescription(
+        name="Reactive power of inverter total output",
+        key="qpower",
+        native_unit_of_measurement=UnitOfReactivePower.VOLT_AMPERE_REACTIVE,
+        icon="mdi:flash",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    "PF": SajModbusSensorEntityDescription(
+        name="Total power factor of inverter",
+        key="pf",
+        device_class=SensorDeviceClass.POWER_FACTOR,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "L1Volt": SajModbusSensorEntityDescription(
+        name="L1 voltage",
+        key="l1volt",
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        device_class=SensorDeviceClass.VOLTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "L1Curr": SajModbusSensorEntityDescription(
+        name="L1 current",
+        key="l1curr",
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        icon="mdi:current-ac",
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "L1Freq": SajModbusSensorEntityDescription(
+        name="L1 frequency",
+        key="l1freq",
+        native_unit_of_measurement=UnitOfFrequency.HERTZ,
+        icon="mdi:sine-wave",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "L1DCI": SajModbusSensorEntityDescription(
+        name="L1 DC component",
+        key="l1dci",
+        native_unit_of_measurement=UnitOfElectricCurrent.MILLIAMPERE,
+        icon="mdi:current-dc",
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "L1Power": SajModbusSensorEntityDescription(
+        name="L1 power",
+        key="l1power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    "L1PF": SajModbusSensorEntityDescription(
+        name="L1 power factor",
+        key="l1pf",
+        device_class=SensorDeviceClass.POWER_FACTOR,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    "L2Volt": SajModbusSensorEntityDescription(
+        name="L2 voltage",
+        key="l2volt",
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        device_class=SensorDeviceClass.VOLTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "L2Curr": SajModbusSensorEntityDescription(
+        name="L2 current",
+        key="l2curr",
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        icon="mdi:current-ac",
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "L2Freq": SajModbusSensorEntityDescription(
+        name="L2 frequency",
+        key="l2freq",
+        native_unit_of_measurement=UnitOfFrequency.HERTZ,
+        icon="mdi:sine-wave",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "L2DCI": SajModbusSensorEntityDescription(
+        name="L2 DC component",
+        key="l2dci",
+        native_unit_of_measurement=UnitOfElectricCurrent.MILLIAMPERE,
+        icon="mdi:current-dc",
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "L2Power": SajModbusSensorEntityDescription(
+        name="L2 power",
+        key="l2power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    "L2PF": SajModbusSensorEntityDescription(
+        name="L2 power factor",
+        key="l2pf",
+        device_class=SensorDeviceClass.POWER_FACTOR,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    "L3Volt": SajModbusSensorEntityDescription(
+        name="L3 voltage",
+        key="l3volt",
+        native_unit_of_measurement=UnitOfElectricPotential.VOLT,
+        device_class=SensorDeviceClass.VOLTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "L3Curr": SajModbusSensorEntityDescription(
+        name="L3 current",
+        key="l3curr",
+        native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
+        icon="mdi:current-ac",
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "L3Freq": SajModbusSensorEntityDescription(
+        name="L3 frequency",
+        key="l3freq",
+        native_unit_of_measurement=UnitOfFrequency.HERTZ,
+        icon="mdi:sine-wave",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "L3DCI": SajModbusSensorEntityDescription(
+        name="L3 DC component",
+        key="l3dci",
+        native_unit_of_measurement=UnitOfElectricCurrent.MILLIAMPERE,
+        icon="mdi:current-dc",
+        device_class=SensorDeviceClass.CURRENT,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    "L3Power": SajModbusSensorEntityDescription(
+        name="L3 power",
+        key="l3power",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        icon="mdi:solar-power",
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    "L3PF": SajModbusSensorEntityDescription(
+        name="L3 power factor",
+        key="l3pf",
+        device_class=SensorDeviceClass.POWER_FACTOR,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    "ISO1": SajModbusSensorEntityDescription(
+        name="PV1+_ISO",
+        key="iso1",
+        native_unit_of_measurement="kΩ",
+        icon="mdi:omega",
+        entity_registry_enabled_default=False,
+    ),
+    "ISO2": SajModbusSensorEntityDescription(
+        name="PV2+_ISO",
+        key="iso2",
+        native_unit_of_measurement="kΩ",
+        icon="mdi:omega",
+        entity_registry_enabled_default=False,
+    ),
+    "ISO3": SajModbusSensorEntityDescription(
+        name="PV3+_ISO",
+        key="iso3",
+        native_unit_of_measurement="kΩ",
+        icon="mdi:omega",
+        entity_registry_enabled_default=False,
+    ),
+    "ISO4": SajModbusSensorEntityDescription(
+        name="PV__ISO",
+        key="iso4",
+        native_unit_of_measurement="kΩ",
+        icon="mdi:omega",
+        entity_registry_enabled_default=False,
+    ),
+    "ErrorCount": SajModbusSensorEntityDescription(
+        name="Error count",
+        key="errorcount",
+        icon="mdi:counter",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+}
+
+# Request statistics, only collected while one of these sensors is enabled.
+DIAGNOSTIC_SENSOR_TYPES: dict[str, SajModbusSensorEntityDescription] = {
+    "PollDuration": SajModbusSensorEntityDescription(
+        name="Poll duration",
+        key="stats_poll_duration",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "RequestLatency": SajModbusSensorEntityDescription(
+        name="Request latency",
+        key="stats_request_latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "QueueDelay": SajModbusSensorEntityDescription(
+        name="Queue delay",
+        key="stats_queue_delay",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    "RequestErrors": SajModbusSensorEntityDescription(
+        name="Request errors",
+        key="stats_request_errors",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        attribute_keys=(
+            "stats_timeouts",
+            "stats_error_responses",
+            "stats_exceptions",
+        ),
+    ),
+    "Retries": SajModbusSensorEntityDescription(
+        name="Retries",
+        key="stats_retries",
+        icon="mdi:refresh",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        attribute_keys=("stats_request_timeout",),
+    ),
+    "BytesReceived": SajModbusSensorEntityDescription(
+        name="Bytes received",
+        key="stats_bytes_received",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        attribute_keys=("stats_bytes_sent",),
+    ),
+    "LastSuccess": SajModbusSensorEntityDescription(
+        name="Last successful poll",
+        key="stats_last_success",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+}
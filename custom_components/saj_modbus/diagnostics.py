@@ -1,14 +1,15 @@
 """Diagnostics support for SAJ Modbus."""
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT
 from homeassistant.core import HomeAssistant
 
-from .hub import SAJModbusHub
+if TYPE_CHECKING:
+    from .hub import SAJModbusHub
 
 TO_REDACT = {
     CONF_HOST,
@@ -28,6 +29,22 @@ async def async_get_config_entry_diagnostics(
         "config_entry_options": async_redact_data(entry.options, TO_REDACT),
         "inverter_data": async_redact_data(hub.inverter_data, TO_REDACT),
         "last_fetched_data": hub.data,
+        "connection": hub.connection_stats,
+        "read_plans": hub.read_plans,
+        "snapshots": hub.snapshot_stats,
+        "clock": hub.clock_stats,
+        "writes": hub.write_stats,
+        "instrumentation": hub.instrumentation_stats,
+        "recorder": hub.recorder
+        and {
+            "path": hub.recorder.path,
+            "frames": hub.recorder.frames,
+            "slots": hub.recorder.slots,
+        },
+        "dispatch": {
+            "suppressed_writes": hub.suppressed_writes,
+            "suppressed_writes_total": hub.suppressed_writes_total,
+        },
     }
 
     return diagnostics_data
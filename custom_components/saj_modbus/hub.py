@@ -1,27 +1,86 @@
 """SAJ Modbus Hub."""
+import asyncio
 import logging
-import threading
+import os
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from functools import partial
+from collections.abc import Callable
 from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.components.number import DOMAIN as NUMBER_DOMAIN
+from homeassistant.const import Platform
 from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers import entity_registry
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from pymodbus.client import ModbusTcpClient
+from homeassistant.util import dt as dt_util, slugify
 from pymodbus.exceptions import ConnectionException, ModbusException
 from pymodbus.pdu import ModbusPDU
 
+from .capture import FORMAT_CSV, Capture
+from .clock import ClockDrift
+from .connection import (
+    PRIORITY_NAMES,
+    PRIORITY_POLL,
+    PRIORITY_REQUEST,
+    RequestExpired,
+    SAJModbusConnection,
+    async_get_connection,
+    async_release_connection,
+)
 from .const import (
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_READ_GAP,
+    DEFAULT_UNIT_ID,
+    DEFAULT_WRITE_INTERVAL,
     DEVICE_STATUSSES,
     DOMAIN,
-    FAULT_MESSAGES,
 )
+from .derived import STRING_POWER_KEYS, DerivedMetrics
+from .instrumentation import STATS_KEYS, Instrumentation
+from .planner import ReadRequest, plan_reads, required_keys
+from .recorder import FrameRecorder, write_snapshot
+from .replay import ReplayConnection
+from .registers import (
+    IDENTITY_BLOCK,
+    POLLED_BLOCKS,
+    POWER_STATE_BLOCK,
+    REALTIME_BLOCK,
+    TIER_FAST,
+    TIER_NORMAL,
+    TIER_SLOW,
+)
+from .writes import WriteQueue
+
+if TYPE_CHECKING:
+    from .profiling import RefreshProfiler
 
 _LOGGER = logging.getLogger(__name__)
 
+# Working modes in which the inverter does not feed in: not connected, waiting.
+IDLE_MODES = (0, 1)
+# Keys that are read whatever entities are enabled, they drive the polling.
+ALWAYS_READ_KEYS = ("mpvmode",)
+# Seconds between writes of the cache, it is also written on shutdown.
+CACHE_SAVE_DELAY = 600
+
+
+@dataclass(slots=True)
+class _Snapshot:
+    """The last good values of a planned register range."""
+
+    values: dict[str, Any]
+    read: float
+    updated: datetime
+    raw: bytes
+    stale: bool = False
+
 
 class SAJModbusHub(DataUpdateCoordinator[dict[str, int | float | str]]):
-    """Thread safe wrapper class for pymodbus."""
+    """Asyncio wrapper class for pymodbus."""
 
     def __init__(
         self,
@@ -30,51 +89,534 @@ class SAJModbusHub(DataUpdateCoordinator[dict[str, int | float | str]]):
         host: str,
         port: int,
         scan_interval: int,
+        fast_scan_interval: int | None = None,
+        slow_scan_interval: int | None = None,
+        max_scan_interval: int = DEFAULT_MAX_SCAN_INTERVAL,
+        unit: int = DEFAULT_UNIT_ID,
+        read_gap: int = DEFAULT_READ_GAP,
+        write_interval: float = DEFAULT_WRITE_INTERVAL,
+        recorder: FrameRecorder | None = None,
+        connection: SAJModbusConnection | ReplayConnection | None = None,
+        max_data_age: int = DEFAULT_MAX_DATA_AGE,
+        store: Store[dict[str, Any]] | None = None,
+        clock_sync_threshold: float = 0.0,
     ) -> None:
-        """Initialize the Modbus hub."""
+        """Initialize the Modbus hub.
+
+        A connection, such as the replay of a recording, replaces the shared
+        connection to the gateway at host and port. The values of a register
+        range that cannot be read are kept for up to max_data_age seconds.
+        The identity and the last values are cached in store. The inverter
+        clock is set when it drifts more than clock_sync_threshold seconds,
+        0 leaves it alone.
+        """
+        self._tier_intervals: dict[str, int] = {
+            TIER_FAST: fast_scan_interval or scan_interval,
+            TIER_NORMAL: scan_interval,
+            TIER_SLOW: slow_scan_interval or scan_interval,
+        }
+        self._min_scan_interval = min(self._tier_intervals.values())
+        self._max_scan_interval = max(max_scan_interval, self._min_scan_interval)
         super().__init__(
             hass,
             _LOGGER,
             name=name,
-            update_interval=timedelta(seconds=scan_interval),
+            update_interval=timedelta(seconds=self._min_scan_interval),
         )
+        self._tier_next_read = dict.fromkeys(self._tier_intervals, 0.0)
+        self._read_plans: dict[frozenset[str], list[ReadRequest]] = {}
+        self._read_gap = read_gap
+        self._max_data_age = max_data_age
+        self._snapshots: dict[ReadRequest, _Snapshot] = {}
+        # Ranges whose last read failed, with the time of the first failure.
+        self._failed_reads: dict[ReadRequest, float] = {}
+        # Keys served from a range whose last read failed, with the time of
+        # the last good read.
+        self.stale_data: dict[str, datetime] = {}
+        self._dispatched_stale: dict[str, datetime] = {}
+        self._store = store
+        self._cache_pending = False
+        self._identity_cached = False
+        self._clock = ClockDrift(clock_sync_threshold)
+        self._derived = DerivedMetrics()
+        self._always_read = ALWAYS_READ_KEYS
+        if clock_sync_threshold:
+            self._always_read += ("datetime",)
 
-        self._client = ModbusTcpClient(host=host, port=port, timeout=5)
-        self._lock = threading.Lock()
+        self._unit = unit
+        self._connection = connection or async_get_connection(hass, host, port, unit)
+        self._spread_polls = True
+        self._shift_refresh = False
+        self.recorder = recorder
+        self._capture_task: asyncio.Task[None] | None = None
+        self._instrumentation: Instrumentation | None = None
+        self._profiler: RefreshProfiler | None = None
+        self._writes = WriteQueue(
+            partial(self._write_registers, unit),
+            partial(self._read_holding_registers, unit),
+            self._async_write_updated,
+            write_interval,
+            # Not started eagerly, the queue registers the worker first.
+            partial(hass.async_create_background_task, eager_start=False),
+        )
         self.inverter_data: dict[str, int | float | str] = {}
         self._power_limit: float = 110.0
         self._power_on_off: bool = False
+        self._fault_words: tuple[int, int, int] = (0, 0, 0)
+        self._faults: dict[str, str | tuple] = {
+            "faultmsg": "",
+            "faultcodes": (),
+            "faultmessages": (),
+        }
+        self._dispatched_data: dict[str, Any] = {}
+        self._dispatched_success: bool | None = None
+        self.suppressed_writes: int = 0
+        self.suppressed_writes_total: int = 0
 
     async def async_setup(self) -> None:
         """Fetch data that is needed only once."""
         try:
-            self.inverter_data = await self.hass.async_add_executor_job(
-                self.read_modbus_inverter_data
-            )
+            inverter_data = await self.read_modbus_inverter_data()
         except (ConnectionException, ModbusException) as ex:
             raise UpdateFailed(f"Failed to fetch inverter data: {ex}") from ex
+        if inverter_data:
+            self.inverter_data = inverter_data
+            self._identity_cached = False
+            self._async_schedule_cache_save()
+
+    async def async_restore(self) -> bool:
+        """Restore the identity and the last values from the cache.
+
+        Returns True when the identity was cached: the hub then has data for
+        the entities before the inverter answered, and reads the identity
+        again on the first refresh that reaches the inverter. Cached values
+        older than max_data_age are not restored.
+        """
+        if self._store is None or not (cache := await self._store.async_load()):
+            return False
+        self.inverter_data = cache["identity"]
+        self._identity_cached = True
+        if derived := cache.get("derived"):
+            self._derived.restore(derived)
+        now = time.monotonic()
+        utcnow = dt_util.utcnow()
+        for address, count, raw, updated in cache["ranges"]:
+            block = next(
+                (
+                    block
+                    for block in POLLED_BLOCKS
+                    if block.address <= address
+                    and address + count <= block.address + block.count
+                ),
+                None,
+            )
+            updated = dt_util.parse_datetime(updated)
+            if block is None or updated is None:
+                continue
+            if (age := (utcnow - updated).total_seconds()) > self._max_data_age:
+                continue
+            request = ReadRequest(block, address, count)
+            raw = bytes.fromhex(raw)
+            values = request.decoder.decode(raw)
+            self._add_derived_values(values)
+            self._snapshots[request] = _Snapshot(
+                values, now - age, updated, raw, stale=True
+            )
+        data = self._snapshot_data()
+        self.data = {
+            **self.inverter_data,
+            **data,
+            **self._control_data(),
+            **self._derived.values(data),
+        }
+        return True
+
+    def _cache_data(self) -> dict[str, Any]:
+        """Return the identity and the last good reads for the cache."""
+        self._cache_pending = False
+        return {
+            "identity": self.inverter_data,
+            "ranges": [
+                [
+                    request.address,
+                    request.count,
+                    snapshot.raw.hex(),
+                    snapshot.updated.isoformat(),
+                ]
+                for request, snapshot in self._snapshots.items()
+            ],
+            "derived": self._derived.state(),
+        }
+
+    @callback
+    def _async_schedule_cache_save(self) -> None:
+        """Schedule a write of the cache unless one is pending."""
+        if self._store is not None and not self._cache_pending:
+            self._cache_pending = True
+            self._store.async_delay_save(self._cache_data, CACHE_SAVE_DELAY)
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh data, under the profiler while one is running."""
+        if (profiler := self._profiler) is None:
+            await super()._async_refresh(*args, **kwargs)
+            return
+        profiler.start_refresh()
+        try:
+            await super()._async_refresh(*args, **kwargs)
+        finally:
+            profiler.end_refresh()
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule a refresh, shifted once into this inverter's slot.
+
+        The refresh schedule keeps the offset from then on. Shifting the
+        schedule rather than sleeping in a refresh keeps the setup of the
+        entry, which awaits the first refresh, from waiting for the slot.
+        """
+        if not self._shift_refresh or self.update_interval is None:
+            super()._schedule_refresh()
+            return
+        interval = self.update_interval
+        if offset := self._connection.poll_offset(self._unit, interval.total_seconds()):
+            self.update_interval = interval + timedelta(seconds=offset)
+        try:
+            super()._schedule_refresh()
+        finally:
+            self.update_interval = interval
+        self._shift_refresh = False
 
     async def _async_update_data(self) -> dict[str, int | float | str]:
         """Fetch realtime data from the inverter."""
+        started = time.monotonic()
         try:
             # If inverter_data is empty, fetch it.
             if not self.inverter_data:
                 await self.async_setup()
+            elif self._identity_cached:
+                # Polls go on with the cached identity while the inverter
+                # does not answer.
+                with suppress(UpdateFailed):
+                    await self.async_setup()
+            elif self._spread_polls:
+                # The next refresh is shifted into this inverter's slot.
+                self._spread_polls = False
+                self._shift_refresh = True
 
-            realtime_data = await self.hass.async_add_executor_job(
-                self.read_modbus_r5_realtime_data
+            now = time.monotonic()
+            tiers = self._due_tiers(now)
+            # Reads still queued by the next tick are stale, drop them.
+            deadline = now + self._min_scan_interval
+            failure = await self._async_read_plan(
+                self._retry_plan(self._read_plan(tiers), now), deadline
             )
-            power_state = await self.hass.async_add_executor_job(
-                self.read_modbus_inverter_power_state
+            self._schedule_tiers(tiers, now)
+            data = self._snapshot_data()
+            if (
+                failure is not None
+                and not data
+                and not isinstance(failure, RequestExpired)
+            ):
+                raise failure
+
+            combined_data = {
+                **self.inverter_data,
+                **data,
+                **self._control_data(),
+            }
+            if self._clock.drift is not None:
+                # Not -0.0.
+                combined_data["clockdrift"] = round(self._clock.drift, 1) or 0.0
+            combined_data.update(self._derived.values(data))
+            self._adapt_update_interval(
+                None if "mpvmode" in self.stale_data else data.get("mpvmode")
             )
-            combined_data = {**self.inverter_data, **realtime_data, **power_state}
-            combined_data["limitpower"] = self._power_limit
-            combined_data["poweronoff"] = self._power_on_off
+            if self._instrumentation is not None:
+                duration = time.monotonic() - started
+                self._instrumentation.add_poll(duration, failure is None)
+                round_trip = self._connection.round_trips.get(self._unit)
+                combined_data.update(
+                    self._instrumentation.poll_data(
+                        duration,
+                        self._connection.queue_stats[PRIORITY_POLL].mean_delay,
+                        round_trip and round_trip.timeout,
+                    )
+                )
             return combined_data
         except (ConnectionException, ModbusException) as ex:
+            self._adapt_update_interval(None)
+            if self._instrumentation is not None:
+                self._instrumentation.add_poll(time.monotonic() - started, False)
             raise UpdateFailed(f"Failed to fetch realtime data: {ex}") from ex
-        finally:
-            self.close()
+
+    async def _async_read_plan(
+        self, plan: list[ReadRequest], deadline: float
+    ) -> ModbusException | None:
+        """Read the ranges of a plan into their snapshots.
+
+        A range that cannot be read keeps its last good values for up to
+        max_data_age seconds, the other ranges are still read. Returns the
+        last failure, RequestExpired when the reads ran out of time.
+        """
+        failure: ModbusException | None = None
+        requests = iter(plan)
+        for request in requests:
+            try:
+                raw = await self._async_read_raw(request, deadline)
+            except (ConnectionException, RequestExpired) as ex:
+                # The remaining reads would fail the same way. The next tick
+                # reads them again.
+                _LOGGER.debug("%s: %s", self.name, ex)
+                for failed in (request, *requests):
+                    self._read_failed(failed)
+                return ex
+            except ModbusException as ex:
+                _LOGGER.debug("%s: %s", self.name, ex)
+                self._read_failed(request)
+                failure = ex
+                continue
+            self._failed_reads.pop(request, None)
+            values = request.decoder.decode(raw)
+            self._add_derived_values(values)
+            updated = dt_util.utcnow()
+            self._snapshots[request] = _Snapshot(
+                values, time.monotonic(), updated, bytes(raw)
+            )
+            if (clock := values.get("datetime")) is not None:
+                self._track_clock(clock, updated)
+            if not values.keys().isdisjoint(STRING_POWER_KEYS):
+                self._derived.add_power(values, self._inverter_time(updated))
+        self._async_schedule_cache_save()
+        return failure
+
+    def _track_clock(self, clock: datetime, read: datetime) -> None:
+        """Update the drift of the inverter clock, and set it when due."""
+        self._clock.add(clock, read)
+        if not self._clock.sync_due(clock, read, time.monotonic()):
+            return
+        self._clock.last_sync = time.monotonic()
+        self._clock.syncs += 1
+        _LOGGER.info(
+            "%s: inverter clock is %.1f seconds off, setting it",
+            self.name,
+            self._clock.drift,
+        )
+        self.hass.async_create_background_task(
+            self._async_sync_clock(), f"{self.name} clock sync"
+        )
+
+    def _inverter_time(self, read: datetime) -> datetime:
+        """Return the time on the inverter clock at a read, from its drift."""
+        return dt_util.as_local(read + timedelta(seconds=self._clock.drift or 0.0))
+
+    async def _async_sync_clock(self) -> None:
+        """Set the inverter clock to the current time."""
+        try:
+            await self.async_set_date_and_time()
+        except ModbusException as ex:
+            _LOGGER.warning("%s: cannot set the inverter clock: %s", self.name, ex)
+
+    def _retry_plan(self, plan: list[ReadRequest], now: float) -> list[ReadRequest]:
+        """Add the ranges that failed to read to the plan of a tick.
+
+        Failed ranges are read again on every tick, without holding back
+        their tiers, until they are read or max_data_age has passed; then
+        they wait for their tiers again.
+        """
+        self._failed_reads = {
+            request: failed
+            for request, failed in self._failed_reads.items()
+            if now - failed <= self._max_data_age
+        }
+        if not self._failed_reads:
+            return plan
+        return plan + [request for request in self._failed_reads if request not in plan]
+
+    def _read_failed(self, request: ReadRequest) -> None:
+        """Mark the values of a range stale, or drop them once too old."""
+        self._failed_reads.setdefault(request, time.monotonic())
+        if (snapshot := self._snapshots.get(request)) is None:
+            return
+        if time.monotonic() - snapshot.read > self._max_data_age:
+            del self._snapshots[request]
+        else:
+            snapshot.stale = True
+
+    def _snapshot_data(self) -> dict[str, Any]:
+        """Merge the snapshots, newest last, and collect the stale keys.
+
+        Snapshots of ranges that are no longer planned are dropped once they
+        could not be due anymore.
+        """
+        horizon = (
+            time.monotonic()
+            - self._max_data_age
+            - max(self._max_scan_interval, *self._tier_intervals.values())
+        )
+        data: dict[str, Any] = {}
+        stale: dict[str, datetime] = {}
+        for request, snapshot in sorted(
+            self._snapshots.items(), key=lambda item: item[1].read
+        ):
+            if snapshot.read < horizon:
+                del self._snapshots[request]
+                continue
+            data.update(snapshot.values)
+            if snapshot.stale:
+                stale.update(dict.fromkeys(snapshot.values, snapshot.updated))
+            elif stale:
+                for key in snapshot.values:
+                    stale.pop(key, None)
+        self.stale_data = stale
+        return data
+
+    @property
+    def standby(self) -> bool:
+        """Return True while polling is backed off."""
+        return self.update_interval.total_seconds() > self._min_scan_interval
+
+    def _adapt_update_interval(self, mpvmode: int | None) -> None:
+        """Stretch the polling interval while the inverter is idle or unreachable.
+
+        The interval doubles up to the configured maximum as long as the
+        inverter is not connected to the grid, waiting or unreachable, and
+        drops back to the scan interval as soon as it reports another mode.
+        """
+        current = self.update_interval.total_seconds()
+        if mpvmode in IDLE_MODES or mpvmode is None:
+            interval = min(current * 2, self._max_scan_interval)
+        else:
+            interval = self._min_scan_interval
+        if interval != current:
+            _LOGGER.debug(
+                "%s: polling every %s seconds (mode %s)", self.name, interval, mpvmode
+            )
+            self.update_interval = timedelta(seconds=interval)
+
+    def _due_tiers(self, now: float) -> frozenset[str]:
+        """Return the polling tiers that are due at this tick."""
+        # Allow half a tick of slack so scheduling jitter does not push a tier
+        # back by a whole tick.
+        slack = self._min_scan_interval / 2
+        return frozenset(
+            tier
+            for tier, next_read in self._tier_next_read.items()
+            if next_read - slack <= now
+        )
+
+    def _schedule_tiers(self, tiers: frozenset[str], now: float) -> None:
+        """Schedule the next read of the tiers that were just polled."""
+        for tier in tiers:
+            self._tier_next_read[tier] = now + self._tier_intervals[tier]
+
+    def _read_plan(self, tiers: frozenset[str]) -> list[ReadRequest]:
+        """Return the merged reads for a set of tiers, planning on first use.
+
+        Only the registers of enabled entities are read. Until the entities
+        have registered, as on the first refresh, everything is read.
+        """
+        if (plan := self._read_plans.get(tiers)) is None:
+            keys = None
+            if self._listeners:
+                keys = required_keys(
+                    (context for _, context in self._listeners.values()),
+                    self._always_read,
+                )
+            plan = self._read_plans[tiers] = [
+                request
+                for block in POLLED_BLOCKS
+                for request in plan_reads(
+                    block,
+                    (
+                        field
+                        for field in block.fields
+                        if field.tier in tiers and (keys is None or field.key in keys)
+                    ),
+                    self._read_gap,
+                )
+            ]
+            _LOGGER.debug(
+                "%s: reading %s for tiers %s",
+                self.name,
+                ", ".join(f"{r.count}@{r.address:#06x}" for r in plan),
+                sorted(tiers),
+            )
+        return plan
+
+    @property
+    def read_plans(self) -> dict[str, list[tuple[int, int]]]:
+        """Return the current reads per set of tiers."""
+        return {
+            "+".join(sorted(tiers)): [
+                (request.address, request.count) for request in plan
+            ]
+            for tiers, plan in self._read_plans.items()
+        }
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates and re-plan the reads for the new entity."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        self._read_plans.clear()
+        self._update_instrumentation()
+
+        @callback
+        def remove() -> None:
+            """Remove the listener and re-plan the reads without it."""
+            remove_listener()
+            self._read_plans.clear()
+            self._update_instrumentation()
+
+        return remove
+
+    def _update_instrumentation(self) -> None:
+        """Collect request statistics only while an entity renders them."""
+        enabled = any(
+            context is not None and not STATS_KEYS.isdisjoint(context)
+            for _, context in self._listeners.values()
+        )
+        if enabled and self._instrumentation is None:
+            self._instrumentation = Instrumentation()
+            self._connection.instruments[self._unit] = self._instrumentation
+        elif not enabled and self._instrumentation is not None:
+            self._instrumentation = None
+            self._connection.instruments.pop(self._unit, None)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update only the listeners whose keys changed since the last update.
+
+        Entities register with a tuple of the data keys they render as their
+        coordinator context. Listeners without a context are always updated,
+        as is everyone when the availability of the hub changes. Keys that
+        turned stale or fresh count as changed.
+        """
+        data = self.data or {}
+        changed: set[str] | None = None
+        if self.last_update_success == self._dispatched_success:
+            previous = self._dispatched_data
+            changed = {
+                key
+                for key, value in data.items()
+                if key not in previous or previous[key] != value
+            }
+            changed.update(previous.keys() - data.keys())
+            changed.update(self.stale_data.keys() ^ self._dispatched_stale.keys())
+        self._dispatched_data = data
+        self._dispatched_success = self.last_update_success
+        self._dispatched_stale = self.stale_data
+
+        suppressed = 0
+        for update_callback, context in list(self._listeners.values()):
+            if changed is None or context is None or not changed.isdisjoint(context):
+                update_callback()
+            else:
+                suppressed += 1
+        self.suppressed_writes = suppressed
+        self.suppressed_writes_total += suppressed
+        _LOGGER.debug("%s: suppressed %s unchanged state writes", self.name, suppressed)
 
     @callback
     def async_remove_listener(self, update_callback: CALLBACK_TYPE) -> None:
@@ -84,231 +626,366 @@ class SAJModbusHub(DataUpdateCoordinator[dict[str, int | float | str]]):
             self.close()
 
     def close(self) -> None:
-        """Disconnect client."""
-        with self._lock:
-            self._client.close()
-
-    def _read_holding_registers(self, unit, address, count):
-        """Read holding registers."""
-        with self._lock:
-            return self._client.read_holding_registers(
-                address=address, count=count, device_id=unit
+        """Disconnect client unless other inverters share the connection."""
+        if self._connection.units <= {self._unit}:
+            self._connection.close()
+
+    async def async_close(self) -> None:
+        """Release the shared connection, closing it if this was the last user."""
+        await self.async_stop_capture()
+        if self._profiler is not None:
+            self._profiler.done.cancel()
+        await self._writes.async_shutdown()
+        await async_release_connection(self.hass, self._connection, self._unit)
+        if self._store is not None and self._cache_pending:
+            await self._store.async_save(self._cache_data())
+        if self.recorder is not None:
+            await self.hass.async_add_executor_job(self.recorder.close)
+
+    async def async_snapshot_frames(self) -> str:
+        """Copy the recorded frames to a timestamped file and return its path."""
+        if self.recorder is None:
+            raise FileNotFoundError(f"{self.name}: frame recording is not enabled")
+        root, ext = os.path.splitext(self.recorder.path)
+        path = f"{root}_{dt_util.now():%Y%m%d_%H%M%S}{ext}"
+        await self.hass.async_add_executor_job(
+            write_snapshot, path, self.recorder.snapshot()
+        )
+        _LOGGER.info(
+            "%s: copied %s recorded frames to %s",
+            self.name,
+            min(self.recorder.frames, self.recorder.slots),
+            path,
+        )
+        return path
+
+    async def async_start_capture(
+        self,
+        keys: list[str],
+        interval: float,
+        duration: float | None = None,
+        samples: int | None = None,
+        fmt: str = FORMAT_CSV,
+    ) -> str:
+        """Start capturing realtime values and return the file they go to.
+
+        A capture that is still running is stopped and written first.
+        """
+        await self.async_stop_capture()
+        capture = Capture(
+            partial(self._read_holding_registers, self._unit),
+            plan_reads(
+                REALTIME_BLOCK,
+                (field for field in REALTIME_BLOCK.fields if field.key in keys),
+                self._read_gap,
+            ),
+            keys,
+            interval,
+            duration,
+            samples,
+        )
+        path = self.hass.config.path(
+            f"{DOMAIN}_{slugify(self.name)}_capture_{dt_util.now():%Y%m%d_%H%M%S}"
+            f".{'csv' if fmt == FORMAT_CSV else 'npy'}"
+        )
+        self._capture_task = self.hass.async_create_background_task(
+            self._async_capture(capture, path, fmt), f"{self.name} capture"
+        )
+        return path
+
+    async def async_stop_capture(self) -> None:
+        """Stop a running capture, writing the samples taken so far."""
+        if self._capture_task is not None and not self._capture_task.done():
+            self._capture_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._capture_task
+        self._capture_task = None
+
+    async def _async_capture(self, capture: Capture, path: str, fmt: str) -> None:
+        """Run a capture and write its samples."""
+        _LOGGER.info(
+            "%s: capturing %s every %ss into %s",
+            self.name,
+            ", ".join(capture.keys),
+            capture.interval,
+            path,
+        )
+        try:
+            await capture.async_run()
+        finally:
+            if capture.samples:
+                await self.hass.async_add_executor_job(capture.write, path, fmt)
+            _LOGGER.info(
+                "%s: captured %s samples (%s missed) into %s",
+                self.name,
+                capture.samples,
+                capture.missed,
+                path,
             )
 
-    def _write_registers(self, unit: int, address: int, values: list[int]) -> ModbusPDU:
+    async def async_start_profile(
+        self, refreshes: int, cpu: bool, memory: bool, top: int
+    ) -> list[str]:
+        """Profile the next refreshes and return the files the results go to."""
+        if self._profiler is not None:
+            raise RuntimeError(f"{self.name} is already being profiled")
+        # cProfile, pstats and tracemalloc are only loaded when they are used.
+        from .profiling import RefreshProfiler
+
+        profiler = self._profiler = RefreshProfiler(refreshes, cpu, memory, top)
+        path = self.hass.config.path(
+            f"{DOMAIN}_{slugify(self.name)}_profile_{dt_util.now():%Y%m%d_%H%M%S}"
+        )
+        self.hass.async_create_background_task(
+            self._async_profile(profiler, path), f"{self.name} profile"
+        )
+        return [f"{path}.pstats", f"{path}.txt"] if cpu else [f"{path}.txt"]
+
+    async def _async_profile(self, profiler: "RefreshProfiler", path: str) -> None:
+        """Wait for the profiled refreshes and write the results."""
+        _LOGGER.info("%s: profiling %s refreshes", self.name, profiler.refreshes)
+        try:
+            await profiler.done
+        except ValueError as ex:
+            _LOGGER.error("%s: cannot profile: %s", self.name, ex)
+            return
+        finally:
+            self._profiler = None
+            profiler.stop()
+        paths = await self.hass.async_add_executor_job(profiler.write, path)
+        _LOGGER.info("%s: profile written to %s", self.name, ", ".join(paths))
+
+    @property
+    def connection_stats(self) -> dict[str, Any]:
+        """Return reconnect counters, queueing delays and the round-trip time."""
+        round_trip = self._connection.round_trips.get(self._unit)
+        return {
+            "connected": self._connection.connected,
+            "connection_age": self._connection.connection_age,
+            "reconnects": self._connection.reconnects,
+            "connect_failures": self._connection.connect_failures,
+            "queues": {
+                name: {
+                    "requests": stats.requests,
+                    "expired": stats.expired,
+                    "mean_delay": stats.mean_delay,
+                    "max_delay": stats.max_delay,
+                }
+                for name, stats in zip(PRIORITY_NAMES, self._connection.queue_stats)
+            },
+            "round_trip": round_trip
+            and {
+                "smoothed": round_trip.smoothed,
+                "variation": round_trip.variation,
+                "timeout": round_trip.timeout,
+                "timeouts": round_trip.timeouts,
+                "retries": round_trip.retries,
+            },
+        }
+
+    @property
+    def instrumentation_stats(self) -> dict[str, Any] | None:
+        """Return the request statistics, None unless they are collected."""
+        if self._instrumentation is None:
+            return None
+        return self._instrumentation.as_dict()
+
+    @property
+    def snapshot_stats(self) -> dict[str, dict[str, Any]]:
+        """Return the age of the values of each read range, and if it is stale."""
+        now = time.monotonic()
+        return {
+            f"{request.count}@{request.address:#06x}": {
+                "age": round(now - snapshot.read, 1),
+                "stale": snapshot.stale,
+            }
+            for request, snapshot in self._snapshots.items()
+        }
+
+    @property
+    def clock_stats(self) -> dict[str, Any]:
+        """Return the drift of the inverter clock and how often it was set."""
+        return {
+            "drift": self._clock.drift,
+            "samples": self._clock.samples,
+            "sync_threshold": self._clock.threshold,
+            "syncs": self._clock.syncs,
+        }
+
+    @property
+    def write_stats(self) -> dict[str, Any]:
+        """Return the counters and confirmation latencies of the write queue."""
+        return {
+            "writes": self._writes.writes,
+            "coalesced": self._writes.coalesced,
+            "failures": self._writes.failures,
+            "confirm_latency": self._writes.confirm_latency,
+        }
+
+    async def _read_holding_registers(
+        self,
+        unit: int,
+        address: int,
+        count: int,
+        priority: int = PRIORITY_REQUEST,
+        deadline: float | None = None,
+    ) -> ModbusPDU:
+        """Read holding registers, recording the response when enabled."""
+        response = await self._connection.async_read_holding_registers(
+            unit, address, count, priority, deadline
+        )
+        if self.recorder is not None and not response.isError():
+            self.recorder.append(unit, address, response.raw)
+        return response
+
+    async def _write_registers(
+        self, unit: int, address: int, values: list[int]
+    ) -> ModbusPDU:
         """Write registers."""
-        with self._lock:
-            return self._client.write_registers(
-                address=address, values=values, device_id=unit
-            )
+        return await self._connection.async_write_registers(unit, address, values)
 
-    def convert_to_signed(self, value: int) -> int:
-        """Convert unsigned integers to signed integers."""
-        if value >= 0x8000:
-            return value - 0x10000
-        return value
-
-    def parse_datetime(self, registers: list[int]) -> datetime:
-        """Extract date and time values from registers."""
-        year = registers[0]
-        month = registers[1] >> 8
-        day = registers[1] & 0xFF
-        hour = registers[2] >> 8
-        minute = registers[2] & 0xFF
-        second = registers[3] >> 8
-
-        timevalues = f"{year}{month:02}{day:02}{hour:02}{minute:02}{second:02}"
-        date_time_obj = datetime.strptime(timevalues, "%Y%m%d%H%M%S").astimezone()
-        return date_time_obj
-
-    def read_modbus_inverter_data(self) -> dict[str, int | float | str]:
+    async def read_modbus_inverter_data(self) -> dict[str, int | float | str]:
         """Read data about inverter."""
-        inverter_data = self._read_holding_registers(unit=1, address=0x8F00, count=29)
+        inverter_data = await self._read_holding_registers(
+            unit=self._unit,
+            address=IDENTITY_BLOCK.address,
+            count=IDENTITY_BLOCK.count,
+        )
         if inverter_data.isError():
             _LOGGER.debug("Error reading inverter data")
             return {}
-        registers = inverter_data.registers
-        data: dict[str, int | float | str] = {
-            "devtype": registers[0],
-            "subtype": registers[1],
-            "commver": round(registers[2] * 0.001, 3),
-            "sn": "".join(
-                chr(registers[i] >> 8) + chr(registers[i] & 0xFF) for i in range(3, 13)
-            ).rstrip("\x00"),
-            "pc": "".join(
-                chr(registers[i] >> 8) + chr(registers[i] & 0xFF) for i in range(13, 23)
-            ).rstrip("\x00"),
-            "dv": round(registers[23] * 0.001, 3),
-            "mcv": round(registers[24] * 0.001, 3),
-            "scv": round(registers[25] * 0.001, 3),
-            "disphwversion": round(registers[26] * 0.001, 3),
-            "ctrlhwversion": round(registers[27] * 0.001, 3),
-            "powerhwversion": round(registers[28] * 0.001, 3),
-        }
-        return data
+        return IDENTITY_BLOCK.decoder.decode(inverter_data.raw)
 
-
-    def read_modbus_r5_realtime_data(self) -> dict[str, int | float | str]:
+    async def read_modbus_r5_realtime_data(self) -> dict[str, int | float | str]:
         """Read realtime data from inverter."""
-        realtime_data = self._read_holding_registers(unit=1, address=0x100, count=59)
-        if realtime_data.isError():
-            _LOGGER.debug("Error reading realtime data")
-            return {}
-        registers = realtime_data.registers
-        data: dict[str, int | float | str] = {}
-        mpvmode = registers[0]
-        data["mpvmode"] = mpvmode
-        data["mpvstatus"] = DEVICE_STATUSSES.get(mpvmode, "Unknown")
-        faultMsg0 = (registers[1] << 16) | registers[2]
-        faultMsg1 = (registers[3] << 16) | registers[4]
-        faultMsg2 = (registers[5] << 16) | registers[6]
-        fault_messages_list = self.translate_fault_code_to_messages(
-            faultMsg0, list(FAULT_MESSAGES[0].items())
+        data = await self._async_read(
+            ReadRequest(REALTIME_BLOCK, REALTIME_BLOCK.address, REALTIME_BLOCK.count)
         )
-        fault_messages_list.extend(
-            self.translate_fault_code_to_messages(
-                faultMsg1, list(FAULT_MESSAGES[1].items())
-            )
-        )
-        fault_messages_list.extend(
-            self.translate_fault_code_to_messages(
-                faultMsg2, list(FAULT_MESSAGES[2].items())
+        self._add_derived_values(data)
+        return data
+
+    async def read_modbus_inverter_power_state(self) -> dict[str, bool]:
+        """Read the power state from the inverter."""
+        data = await self._async_read(
+            ReadRequest(
+                POWER_STATE_BLOCK, POWER_STATE_BLOCK.address, POWER_STATE_BLOCK.count
             )
         )
-        data["faultmsg"] = ", ".join(fault_messages_list).strip()[:254]
-        if fault_messages_list:
-            _LOGGER.error("Fault message: %s", ", ".join(fault_messages_list).strip())
-        data["pv1volt"] = round(registers[7] * 0.1, 1)
-        data["pv1curr"] = round(registers[8] * 0.01, 2)
-        data["pv1power"] = registers[9]
-        data["pv2volt"] = round(registers[10] * 0.1, 1)
-        data["pv2curr"] = round(registers[11] * 0.01, 2)
-        data["pv2power"] = registers[12]
-        data["pv3volt"] = round(registers[13] * 0.1, 1)
-        data["pv3curr"] = round(registers[14] * 0.01, 2)
-        data["pv3power"] = registers[15]
-        data["busvolt"] = round(registers[16] * 0.1, 1)
-        data["invtempc"] = round(self.convert_to_signed(registers[17]) * 0.1, 1)
-        data["gfci"] = self.convert_to_signed(registers[18])
-        data["power"] = registers[19]
-        data["qpower"] = self.convert_to_signed(registers[20])
-        data["pf"] = round(self.convert_to_signed(registers[21]) * 0.001, 3)
-        data["l1volt"] = round(registers[22] * 0.1, 1)
-        data["l1curr"] = round(registers[23] * 0.01, 2)
-        data["l1freq"] = round(registers[24] * 0.01, 2)
-        data["l1dci"] = self.convert_to_signed(registers[25])
-        data["l1power"] = registers[26]
-        data["l1pf"] = round(self.convert_to_signed(registers[27]) * 0.001, 3)
-        data["l2volt"] = round(registers[28] * 0.1, 1)
-        data["l2curr"] = round(registers[29] * 0.01, 2)
-        data["l2freq"] = round(registers[30] * 0.01, 2)
-        data["l2dci"] = self.convert_to_signed(registers[31])
-        data["l2power"] = registers[32]
-        data["l2pf"] = round(self.convert_to_signed(registers[33]) * 0.001, 3)
-        data["l3volt"] = round(registers[34] * 0.1, 1)
-        data["l3curr"] = round(registers[35] * 0.01, 2)
-        data["l3freq"] = round(registers[36] * 0.01, 2)
-        data["l3dci"] = self.convert_to_signed(registers[37])
-        data["l3power"] = registers[38]
-        data["l3pf"] = round(self.convert_to_signed(registers[39]) * 0.001, 3)
-        data["iso1"] = registers[40]
-        data["iso2"] = registers[41]
-        data["iso3"] = registers[42]
-        data["iso4"] = registers[43]
-        data["todayenergy"] = round(registers[44] * 0.01, 2)
-        data["monthenergy"] = round(((registers[45] << 16) | registers[46]) * 0.01, 2)
-        data["yearenergy"] = round(((registers[47] << 16) | registers[48]) * 0.01, 2)
-        data["totalenergy"] = round(((registers[49] << 16) | registers[50]) * 0.01, 2)
-        data["todayhour"] = round(registers[51] * 0.1, 1)
-        data["totalhour"] = round(((registers[52] << 16) | registers[53]) * 0.1, 1)
-        data["errorcount"] = registers[54]
-        data["datetime"] = self.parse_datetime(registers[55:59])
+        self._add_derived_values(data)
         return data
 
-    def read_modbus_inverter_power_state(self) -> dict[str, bool]:
-        """Read the power state from the inverter."""
-        power_state_data = self._read_holding_registers(unit=1, address=0x1037, count=1)
-        if power_state_data.isError():
-            _LOGGER.debug("Error reading power state data")
-            return {}
-        self._power_on_off = power_state_data.registers[0] == 1
-        return {"poweronoff": self._power_on_off}
+    async def _async_read(
+        self, request: ReadRequest, deadline: float | None = None
+    ) -> dict[str, Any]:
+        """Read and decode one planned register range as a scheduled poll."""
+        return request.decoder.decode(await self._async_read_raw(request, deadline))
 
-    def translate_fault_code_to_messages(
-        self, fault_code: int, fault_messages: list[tuple[int, str]]
-    ) -> list[str]:
-        """Translate faultcodes to readable messages."""
-        messages = []
-        if not fault_code:
-            return messages
-        for code, mesg in fault_messages:
-            if fault_code & code:
-                messages.append(mesg)
-        return messages
-
-    def _write_limit_power_sync(self, value: float) -> bool:
-        """Write the power limit to the inverter."""
-        response = self._write_registers(unit=1, address=0x801F, values=[int(value * 10)])
+    async def _async_read_raw(
+        self, request: ReadRequest, deadline: float | None = None
+    ) -> memoryview:
+        """Read the register bytes of one planned range as a scheduled poll."""
+        response = await self._read_holding_registers(
+            unit=self._unit,
+            address=request.address,
+            count=request.count,
+            priority=PRIORITY_POLL,
+            deadline=deadline,
+        )
         if response.isError():
-            _LOGGER.error("Failed to set limitpower")
-            return False
-        return True
+            raise ModbusException(
+                f"Error reading {request.count} registers at {request.address:#06x}"
+            )
+        return response.raw
 
-    def _write_power_on_off_sync(self, value: bool) -> bool:
-        """Write the power on/off command to the inverter."""
-        # According to the documentation, address 0x1037 is used for remote power on/off
-        # 0: power off, 1: power on
-        register_value = 1 if value else 0
-        response = self._write_registers(unit=1, address=0x1037, values=[register_value])
-        if response.isError():
-            _LOGGER.error("Failed to set power on/off")
-            return False
-        return True
+    def _add_derived_values(self, data: dict[str, Any]) -> None:
+        """Add the values that are derived from decoded registers."""
+        if "mpvmode" in data:
+            data["mpvstatus"] = DEVICE_STATUSSES.get(data["mpvmode"], "Unknown")
+        if "faultword0" in data:
+            data.update(
+                self._translate_fault_words(
+                    (data["faultword0"], data["faultword1"], data["faultword2"])
+                )
+            )
+        if "poweronoff" in data:
+            self._power_on_off = data["poweronoff"]
+
+    def _translate_fault_words(
+        self, fault_words: tuple[int, int, int]
+    ) -> dict[str, str | tuple]:
+        """Translate the fault words, reusing the last result if unchanged."""
+        if fault_words != self._fault_words:
+            self._fault_words = fault_words
+            # Loaded on the first poll rather than with the integration.
+            from .faults import fault_values
+
+            self._faults = fault_values(fault_words)
+            if messages := self._faults["faultmessages"]:
+                _LOGGER.error("Fault message: %s", ", ".join(messages).strip())
+            else:
+                _LOGGER.info("Fault cleared")
+        return self._faults
+
+    def _control_data(self) -> dict[str, Any]:
+        """Return the control values, with the optimistic ones of pending writes."""
+        return {
+            "limitpower": self._power_limit,
+            "poweronoff": self._power_on_off,
+            **self._writes.optimistic,
+        }
+
+    @callback
+    def _async_write_updated(self, key: str, value: Any) -> None:
+        """Publish a control value that is being written or was written."""
+        if key == "limitpower" and value is not None:
+            self._power_limit = value
+        elif key == "poweronoff" and value is not None:
+            self._power_on_off = value
+        if self.data:
+            # Not async_set_updated_data, that would postpone the next poll.
+            self.data = {**self.data, **self._control_data()}
+            self.async_update_listeners()
 
     async def async_set_power_on_off(self, value: bool) -> bool:
         """Set the power on/off on the inverter."""
-        if await self.hass.async_add_executor_job(self._write_power_on_off_sync, value):
-            self._power_on_off = value
-            if self.data:
-                new_data = self.data.copy()
-                new_data["poweronoff"] = value
-                self.async_set_updated_data(new_data)
-            return True
-        return False
+        # According to the documentation, address 0x1037 is used for remote power on/off
+        # 0: power off, 1: power on
+        return await self._writes.async_write(
+            0x1037, [1 if value else 0], "poweronoff", value
+        )
 
     async def async_set_limit_power(self, value: float) -> bool:
         """Set the power limit on the inverter."""
         if self.limiter_is_disabled():
             return False
 
-        if await self.hass.async_add_executor_job(self._write_limit_power_sync, value):
-            self._power_limit = value
-            if self.data:
-                new_data = self.data.copy()
-                new_data["limitpower"] = value
-                self.async_set_updated_data(new_data)
-            return True
-        return False
+        return await self._writes.async_write(
+            0x801F, [int(value * 10)], "limitpower", value
+        )
 
-    def set_date_and_time(self, date_time: datetime | None = None) -> None:
-        """Set the time and date on the inverter."""
+    async def async_set_date_and_time(self, date_time: datetime | None = None) -> None:
+        """Set the time and date on the inverter, in Home Assistant's time zone."""
         if date_time is None:
-            date_time = datetime.now()
+            # The clock registers count whole seconds, round to the nearest.
+            date_time = dt_util.now() + timedelta(milliseconds=500)
+        elif date_time.tzinfo is not None:
+            date_time = dt_util.as_local(date_time)
         values = [
             date_time.year,
             (date_time.month << 8) + date_time.day,
             (date_time.hour << 8) + date_time.minute,
             (date_time.second << 8),
         ]
-        response = self._write_registers(unit=1, address=0x8020, values=values)
-        if response.isError():
+        # The clock moves on, so there is nothing to read back.
+        if not await self._writes.async_write(0x8020, values, confirm=False):
             raise ModbusException("Error setting date and time")
+        self._clock.reset()
 
     def limiter_is_disabled(self) -> bool:
         """Return True if the limiter entity is disabled, False otherwise."""
         ent_reg = entity_registry.async_get(self.hass)
         limiter_entity_id = ent_reg.async_get_entity_id(
-            NUMBER_DOMAIN, DOMAIN, f"{self.name}_limitpower"
+            Platform.NUMBER, DOMAIN, f"{self.name}_limitpower"
         )
         if limiter_entity_id is None or (
             ent_reg_entry := ent_reg.async_get(limiter_entity_id)
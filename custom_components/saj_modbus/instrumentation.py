@@ -0,0 +1,185 @@
+"""Request and poll statistics of a SAJ inverter.
+
+The connection measures every transaction of a unit that has an
+Instrumentation attached, from sending the request to receiving the
+response, so the time spent waiting for the bus is not included; that is
+in the queue statistics of the connection. Without an Instrumentation the
+connection skips all of this.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+# Upper bounds in seconds of the latency histogram buckets, the last bucket
+# holds everything slower.
+LATENCY_BUCKETS = (0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+# Data keys of the statistics, rendered by the diagnostic sensors.
+STATS_KEYS = frozenset(
+    {
+        "stats_poll_duration",
+        "stats_request_latency",
+        "stats_queue_delay",
+        "stats_request_errors",
+        "stats_retries",
+        "stats_request_timeout",
+        "stats_timeouts",
+        "stats_error_responses",
+        "stats_exceptions",
+        "stats_bytes_received",
+        "stats_bytes_sent",
+        "stats_last_success",
+    }
+)
+
+
+@dataclass(slots=True)
+class RequestStats:
+    """Counters and latency histogram of one kind of request."""
+
+    requests: int = 0
+    retries: int = 0
+    timeouts: int = 0
+    error_responses: int = 0
+    exceptions: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    total_latency: float = 0.0
+    last_success: float | None = None
+    histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for the diagnostics."""
+        answered = self.requests - self.timeouts - self.exceptions
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "error_responses": self.error_responses,
+            "exceptions": self.exceptions,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "mean_latency": self.total_latency / answered if answered else None,
+            "last_success": self.last_success,
+            "histogram": dict(zip((*map(str, LATENCY_BUCKETS), "inf"), self.histogram)),
+        }
+
+
+class Instrumentation:
+    """Statistics of the requests and polls of one inverter."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.requests: dict[str, RequestStats] = {}
+        self.polls = RequestStats()
+        self._poll_latency = 0.0
+        self._poll_requests = 0
+
+    def add_response(
+        self,
+        kind: str,
+        latency: float,
+        sent: int,
+        received: int,
+        error: bool,
+    ) -> None:
+        """Record an answered request."""
+        stats = self._stats(kind)
+        stats.requests += 1
+        stats.bytes_sent += sent
+        stats.bytes_received += received
+        stats.total_latency += latency
+        stats.histogram[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        if error:
+            stats.error_responses += 1
+        else:
+            stats.last_success = time.time()
+        self._poll_latency += latency
+        self._poll_requests += 1
+
+    def add_failure(self, kind: str, sent: int, timeout: bool) -> None:
+        """Record a request that got no response."""
+        stats = self._stats(kind)
+        stats.requests += 1
+        stats.bytes_sent += sent
+        if timeout:
+            stats.timeouts += 1
+        else:
+            stats.exceptions += 1
+
+    def add_retry(self, kind: str) -> None:
+        """Record that a failed request is sent again."""
+        self._stats(kind).retries += 1
+
+    def add_poll(self, duration: float, success: bool) -> None:
+        """Record a refresh of the hub."""
+        self.polls.requests += 1
+        self.polls.total_latency += duration
+        self.polls.histogram[bisect_left(LATENCY_BUCKETS, duration)] += 1
+        if success:
+            self.polls.last_success = time.time()
+        else:
+            self.polls.exceptions += 1
+
+    def poll_data(
+        self, duration: float, queue_delay: float, request_timeout: float | None
+    ) -> dict[str, Any]:
+        """Return the data values of the statistics after a poll.
+
+        The request latency is the mean of the requests since the last poll,
+        the request timeout the one the connection uses for the next request.
+        """
+        requests = self.requests.values()
+        data = {
+            "stats_poll_duration": round(duration * 1000, 1),
+            "stats_request_latency": (
+                round(self._poll_latency / self._poll_requests * 1000, 1)
+                if self._poll_requests
+                else None
+            ),
+            "stats_queue_delay": round(queue_delay * 1000, 1),
+            "stats_retries": sum(stats.retries for stats in requests),
+            "stats_request_timeout": (
+                round(request_timeout * 1000) if request_timeout is not None else None
+            ),
+            "stats_timeouts": sum(stats.timeouts for stats in requests),
+            "stats_error_responses": sum(stats.error_responses for stats in requests),
+            "stats_exceptions": sum(stats.exceptions for stats in requests),
+            "stats_bytes_received": sum(stats.bytes_received for stats in requests),
+            "stats_bytes_sent": sum(stats.bytes_sent for stats in requests),
+            "stats_last_success": (
+                datetime.fromtimestamp(self.polls.last_success, UTC)
+                if self.polls.last_success is not None
+                else None
+            ),
+        }
+        data["stats_request_errors"] = (
+            data["stats_timeouts"]
+            + data["stats_error_responses"]
+            + data["stats_exceptions"]
+        )
+        self._poll_latency = 0.0
+        self._poll_requests = 0
+        return data
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all statistics for the diagnostics."""
+        return {
+            "polls": self.polls.as_dict(),
+            "requests": {
+                kind: stats.as_dict() for kind, stats in self.requests.items()
+            },
+        }
+
+    def _stats(self, kind: str) -> RequestStats:
+        """Return the statistics of a kind of request."""
+        if (stats := self.requests.get(kind)) is None:
+            stats = self.requests[kind] = RequestStats()
+        return stats
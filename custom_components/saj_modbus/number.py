@@ -8,7 +8,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import (
+from .descriptions import (
     NUMBER_TYPES,
     SajModbusNumberEntityDescription,
 )
@@ -48,7 +48,7 @@ class SajNumber(CoordinatorEntity[SAJModbusHub], NumberEntity):
         description: SajModbusNumberEntityDescription,
     ) -> None:
         """Initialize the number entity."""
-        super().__init__(coordinator=hub)
+        super().__init__(coordinator=hub, context=(description.key,))
         self._attr_device_info = device_info
         self.entity_description = description
         self._attr_unique_id = f"{hub.name}_{description.key}"
@@ -0,0 +1,70 @@
+"""Read planning for the SAJ register map."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from operator import attrgetter
+
+from .const import MAX_READ_COUNT
+from .registers import DERIVED_KEYS, RegisterBlock, RegisterDecoder, RegisterField
+
+
+@dataclass(frozen=True, slots=True)
+class ReadRequest:
+    """A single read holding registers transaction."""
+
+    block: RegisterBlock
+    address: int
+    count: int
+
+    @property
+    def decoder(self) -> RegisterDecoder:
+        """Return the compiled decoder of the range."""
+        return self.block.decoder_for(self.address, self.count)
+
+
+def required_keys(
+    contexts: Iterable[Iterable[str] | None], always: Iterable[str] = ()
+) -> frozenset[str] | None:
+    """Return the register keys needed to render the given listener contexts.
+
+    Derived keys are replaced by the registers they are computed from. None
+    means a listener needs every key.
+    """
+    keys = set(always)
+    for context in contexts:
+        if context is None:
+            return None
+        for key in context:
+            keys.update(DERIVED_KEYS.get(key, (key,)))
+    return frozenset(keys)
+
+
+def plan_reads(
+    block: RegisterBlock,
+    fields: Iterable[RegisterField],
+    max_gap: int = 0,
+    max_count: int = MAX_READ_COUNT,
+) -> list[ReadRequest]:
+    """Merge the fields of a block into as few reads as possible.
+
+    Fields are merged into one read when at most max_gap unused registers
+    separate them and the read stays within max_count registers.
+    """
+    requests: list[ReadRequest] = []
+    start = end = -1
+    for field in sorted(fields, key=attrgetter("address")):
+        if (
+            start >= 0
+            and field.address - end <= max_gap
+            and field.end - start <= max_count
+        ):
+            end = max(end, field.end)
+            continue
+        if start >= 0:
+            requests.append(ReadRequest(block, start, end - start))
+        start, end = field.address, field.end
+    if start >= 0:
+        requests.append(ReadRequest(block, start, end - start))
+    return requests
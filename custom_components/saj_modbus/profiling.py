@@ -0,0 +1,92 @@
+"""Profiling of the refreshes of a hub.
+
+A RefreshProfiler runs cProfile and/or tracemalloc while the hub refreshes,
+for a number of refreshes: reading, decoding, fault translation, merging
+the data and updating the entities. The profiler sees everything that runs
+on the event loop during a refresh, including other integrations while the
+hub waits for the inverter, so the cumulative times of the hub's own
+functions are the numbers to look at.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import pstats
+import tracemalloc
+
+
+class RefreshProfiler:
+    """Profile a number of refreshes."""
+
+    def __init__(self, refreshes: int, cpu: bool, memory: bool, top: int) -> None:
+        """Initialize the profiler."""
+        self.refreshes = refreshes
+        self.top = top
+        self.profiled = 0
+        self._profile = cProfile.Profile() if cpu else None
+        self._memory = memory
+        self._started_tracing = False
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self.done: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+
+    def start_refresh(self) -> None:
+        """Start profiling a refresh."""
+        if self._memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self._profile is not None:
+            try:
+                self._profile.enable()
+            except ValueError as ex:
+                # Another profiler is active, on this hub or elsewhere.
+                self._profile = None
+                self.stop()
+                if not self.done.done():
+                    self.done.set_exception(ex)
+
+    def end_refresh(self) -> None:
+        """Stop profiling a refresh, and finish after the last one."""
+        if self.done.done():
+            return
+        if self._profile is not None:
+            self._profile.disable()
+        self.profiled += 1
+        if self.profiled >= self.refreshes:
+            self.stop()
+            self.done.set_result(None)
+
+    def stop(self) -> None:
+        """Take the memory snapshot and stop tracing, if this profiler started it."""
+        if self._profile is not None:
+            self._profile.disable()
+        if self._memory and tracemalloc.is_tracing() and self._snapshot is None:
+            self._snapshot = tracemalloc.take_snapshot()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def write(self, path: str) -> list[str]:
+        """Write the pstats file and the text summary, return their paths."""
+        text = io.StringIO()
+        paths = []
+        text.write(f"{self.profiled} refreshes profiled\n")
+        if self._profile is not None:
+            paths.append(f"{path}.pstats")
+            self._profile.dump_stats(paths[-1])
+            stats = pstats.Stats(self._profile, stream=text)
+            for title, key in (
+                ("cumulative time", pstats.SortKey.CUMULATIVE),
+                ("own time", pstats.SortKey.TIME),
+            ):
+                text.write(f"\nTop {self.top} functions by {title}\n")
+                stats.sort_stats(key).print_stats(self.top)
+        if self._snapshot is not None:
+            text.write(f"\nTop {self.top} lines by allocated memory\n")
+            for stat in self._snapshot.statistics("lineno")[: self.top]:
+                text.write(f"{stat}\n")
+        paths.append(f"{path}.txt")
+        with open(paths[-1], "w", encoding="utf-8") as file:
+            file.write(text.getvalue())
+        return paths
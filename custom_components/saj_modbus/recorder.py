@@ -0,0 +1,168 @@
+"""Ring file of raw register frames read from SAJ inverters.
+
+The file starts with a header, followed by a fixed number of equally sized
+slots. Each slot holds one read response: the time it was received, the unit
+and start address, the number of registers and the register bytes as the
+inverter sent them (big-endian). Frames are written round robin into the
+slots of a memory map, so appending costs two small copies and the file
+never grows.
+
+The module only needs the standard library, so offline tools can read
+recordings without Home Assistant or pymodbus.
+"""
+
+from __future__ import annotations
+
+import csv
+import mmap
+import os
+import struct
+import time
+from collections.abc import Iterator
+from typing import NamedTuple
+
+MAGIC = b"SAJFRAME"
+VERSION = 1
+MAX_WORDS = 125
+DEFAULT_SLOTS = 16384
+
+# magic, version, words per slot, slots, frames written
+HEADER = struct.Struct("<8sHHIQ")
+HEADER_SIZE = 32
+CURSOR_OFFSET = 16
+CURSOR = struct.Struct("<Q")
+# received at (unix time), unit, address, number of registers
+SLOT_HEADER = struct.Struct("<dHHHxx")
+SLOT_SIZE = SLOT_HEADER.size + MAX_WORDS * 2
+
+
+class Frame(NamedTuple):
+    """A recorded read response."""
+
+    timestamp: float
+    unit: int
+    address: int
+    raw: bytes
+
+
+class FrameRecorder:
+    """Append-only ring of register frames in a memory-mapped file.
+
+    open and close do file I/O and belong in the executor; append only
+    writes to the memory map and snapshot only copies it, both on the
+    thread that appends.
+    """
+
+    def __init__(self, path: str, slots: int = DEFAULT_SLOTS) -> None:
+        """Initialize the recorder."""
+        self.path = path
+        self.slots = slots
+        self._file = None
+        self._map: mmap.mmap | None = None
+        self.frames = 0
+
+    def open(self) -> None:
+        """Open the ring file, creating or resetting it when needed."""
+        size = HEADER_SIZE + self.slots * SLOT_SIZE
+        self._file = open(self.path, "a+b")  # noqa: SIM115
+        if os.fstat(self._file.fileno()).st_size != size:
+            self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        magic, version, words, slots, frames = HEADER.unpack_from(self._map)
+        if (magic, version, words, slots) == (MAGIC, VERSION, MAX_WORDS, self.slots):
+            self.frames = frames
+        else:
+            self.frames = 0
+            HEADER.pack_into(self._map, 0, MAGIC, VERSION, MAX_WORDS, self.slots, 0)
+
+    def append(
+        self,
+        unit: int,
+        address: int,
+        raw: bytes | memoryview,
+        timestamp: float | None = None,
+    ) -> None:
+        """Record the register bytes of a read response, received now by default."""
+        if self._map is None:
+            return
+        offset = HEADER_SIZE + self.frames % self.slots * SLOT_SIZE
+        SLOT_HEADER.pack_into(
+            self._map,
+            offset,
+            time.time() if timestamp is None else timestamp,
+            unit,
+            address,
+            len(raw) // 2,
+        )
+        start = offset + SLOT_HEADER.size
+        self._map[start : start + len(raw)] = raw
+        self.frames += 1
+        CURSOR.pack_into(self._map, CURSOR_OFFSET, self.frames)
+
+    def snapshot(self) -> bytes:
+        """Return a copy of the ring file, for write_snapshot.
+
+        The copy is taken between two appends, so it never holds a half
+        written slot or header.
+        """
+        if self._map is None:
+            raise FileNotFoundError(f"Frame recorder {self.path} is not open")
+        return bytes(self._map)
+
+    def close(self) -> None:
+        """Flush and close the ring file."""
+        if self._map is not None:
+            self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def write_snapshot(path: str, data: bytes) -> None:
+    """Write a snapshot of a ring file."""
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+def read_frames(path: str) -> Iterator[Frame]:
+    """Yield the frames of a ring file or snapshot, oldest first."""
+    with open(path, "rb") as file:
+        data = file.read()
+    magic, version, words, slots, frames = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or words != MAX_WORDS:
+        raise ValueError(f"{path} is not a SAJ frame file")
+    for index in range(max(frames - slots, 0), frames):
+        offset = HEADER_SIZE + index % slots * SLOT_SIZE
+        timestamp, unit, address, count = SLOT_HEADER.unpack_from(data, offset)
+        start = offset + SLOT_HEADER.size
+        yield Frame(timestamp, unit, address, data[start : start + count * 2])
+
+
+def load_frames(path: str) -> list[Frame]:
+    """Load the frames of a recorder file or a CSV file, oldest first.
+
+    A CSV file has one frame per line: timestamp, unit, start address and
+    the register values, for example ``1718000000.0,1,0x100,2,0,64``. Lines
+    starting with ``#`` are skipped.
+    """
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) == MAGIC:
+            return list(read_frames(path))
+    frames: list[Frame] = []
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.reader(file):
+            if not row or row[0].lstrip().startswith("#"):
+                continue
+            timestamp, unit, address, *words = row
+            frames.append(
+                Frame(
+                    float(timestamp),
+                    int(unit, 0),
+                    int(address, 0),
+                    struct.pack(f">{len(words)}H", *(int(word, 0) for word in words)),
+                )
+            )
+    frames.sort(key=lambda frame: frame.timestamp)
+    return frames
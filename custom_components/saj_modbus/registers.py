@@ -0,0 +1,358 @@
+"""Register map of the SAJ R5 inverter.
+
+Every value is described once as a RegisterField. Each RegisterBlock compiles
+its fields at import into a single struct format plus a scale and precision
+vector, so decoding a response is one unpack and one pass over the values.
+New registers from the protocol PDF only need a new RegisterField entry.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, tzinfo
+from operator import attrgetter, itemgetter, mul
+from typing import Any
+
+KIND_NUMBER = "number"
+KIND_TEXT = "text"
+KIND_DATETIME = "datetime"
+KIND_BOOL = "bool"
+
+TIER_FAST = "fast"
+TIER_NORMAL = "normal"
+TIER_SLOW = "slow"
+TIER_ONCE = "once"
+
+
+@dataclass(frozen=True, slots=True)
+class RegisterField:
+    """A value stored in one or more consecutive holding registers."""
+
+    key: str
+    address: int
+    width: int = 1
+    signed: bool = False
+    scale: float = 1
+    precision: int | None = None
+    kind: str = KIND_NUMBER
+    tier: str = TIER_NORMAL
+
+    @property
+    def end(self) -> int:
+        """Return the address after the last register of the field."""
+        return self.address + self.width
+
+
+def parse_datetime(registers: Sequence[int]) -> datetime | None:
+    """Extract date and time values from registers."""
+    return _decode_datetime(*registers[:4])
+
+
+def _decode_text(raw: bytes) -> str:
+    """Decode a NUL padded string."""
+    return raw.decode("latin-1").rstrip("\x00")
+
+
+def _decode_datetime(
+    year: int, month_day: int, hour_minute: int, second: int
+) -> datetime | None:
+    """Decode the four clock registers, in Home Assistant's time zone.
+
+    Returns None for a clock that is not set, such as all zeros after boot.
+    """
+    try:
+        return datetime(
+            year,
+            month_day >> 8,
+            month_day & 0xFF,
+            hour_minute >> 8,
+            hour_minute & 0xFF,
+            second >> 8,
+            tzinfo=_time_zone(),
+        )
+    except ValueError:
+        return None
+
+
+def _time_zone() -> tzinfo:
+    """Return Home Assistant's time zone.
+
+    Imported on use, so the register map can be used without Home Assistant
+    as long as no clock is decoded.
+    """
+    from homeassistant.util import dt as dt_util
+
+    return dt_util.get_default_time_zone()
+
+
+def _decode_bool(register: int) -> bool:
+    """Decode an on/off register."""
+    return register == 1
+
+
+_CONVERTERS: dict[str, Callable[..., Any]] = {
+    KIND_TEXT: _decode_text,
+    KIND_DATETIME: _decode_datetime,
+    KIND_BOOL: _decode_bool,
+}
+
+
+def _format(field: RegisterField) -> tuple[str, int]:
+    """Return the struct format of a field and the number of values it yields."""
+    if field.kind == KIND_TEXT:
+        return f"{field.width * 2}s", 1
+    if field.kind == KIND_DATETIME:
+        return f"{field.width}H", field.width
+    if field.kind == KIND_BOOL:
+        return "H", 1
+    if field.width == 1:
+        return ("h" if field.signed else "H"), 1
+    if field.width == 2:
+        return ("i" if field.signed else "I"), 1
+    raise ValueError(f"Unsupported width {field.width} for {field.key}")
+
+
+def _getter(indices: list[int]) -> Callable[[tuple], tuple]:
+    """Return a callable that picks the given indices as a tuple."""
+    if not indices:
+        return lambda values: ()
+    if len(indices) == 1:
+        index = indices[0]
+        return lambda values: (values[index],)
+    return itemgetter(*indices)
+
+
+class RegisterDecoder:
+    """Precompiled decode plan for a contiguous range of registers."""
+
+    __slots__ = (
+        "_keys",
+        "_numbers",
+        "_precisions",
+        "_scales",
+        "_special",
+        "_struct",
+        "_words",
+    )
+
+    def __init__(
+        self, address: int, count: int, fields: Iterable[RegisterField]
+    ) -> None:
+        """Compile the decode plan."""
+        fmt = [">"]
+        position = address
+        index = 0
+        keys: list[str] = []
+        numbers: list[int] = []
+        scales: list[float] = []
+        precisions: list[int | None] = []
+        special: list[tuple[str, slice, Callable[..., Any]]] = []
+
+        for field in sorted(fields, key=attrgetter("address")):
+            if field.address < position or field.end > address + count:
+                raise ValueError(f"Field {field.key} does not fit the register range")
+            if field.address > position:
+                fmt.append(f"{(field.address - position) * 2}x")
+            code, size = _format(field)
+            fmt.append(code)
+            if field.kind == KIND_NUMBER:
+                keys.append(field.key)
+                numbers.append(index)
+                scales.append(field.scale)
+                precisions.append(field.precision)
+            else:
+                special.append(
+                    (field.key, slice(index, index + size), _CONVERTERS[field.kind])
+                )
+            index += size
+            position = field.end
+        if position < address + count:
+            fmt.append(f"{(address + count - position) * 2}x")
+
+        self._struct = struct.Struct("".join(fmt))
+        self._words = struct.Struct(f">{count}H")
+        self._keys = tuple(keys)
+        self._numbers = _getter(numbers)
+        self._scales = tuple(scales)
+        self._precisions = tuple(precisions)
+        self._special = tuple(special)
+
+    def decode(self, buffer: bytes | memoryview) -> dict[str, Any]:
+        """Decode a big-endian register buffer into a dict of values.
+
+        The buffer is unpacked in place, text fields are decoded with a single
+        bytes.decode and 32-bit counters come out of the struct as words.
+        """
+        values = self._struct.unpack_from(buffer)
+        data = dict(
+            zip(
+                self._keys,
+                map(
+                    round,
+                    map(mul, self._numbers(values), self._scales),
+                    self._precisions,
+                ),
+            )
+        )
+        for key, part, convert in self._special:
+            data[key] = convert(*values[part])
+        return data
+
+    def decode_registers(self, registers: Sequence[int]) -> dict[str, Any]:
+        """Decode a list of register values into a dict of values."""
+        return self.decode(self._words.pack(*registers))
+
+
+class RegisterBlock:
+    """A range of holding registers that is read in one request."""
+
+    def __init__(
+        self, address: int, count: int, fields: Iterable[RegisterField]
+    ) -> None:
+        """Initialize the block and compile its decoder."""
+        self.address = address
+        self.count = count
+        self.fields = tuple(sorted(fields, key=attrgetter("address")))
+        self.decoder = RegisterDecoder(address, count, self.fields)
+        self._decoders = {(address, count): self.decoder}
+
+    def decoder_for(self, address: int, count: int) -> RegisterDecoder:
+        """Return the decoder of a sub-range, compiling it on first use."""
+        if (decoder := self._decoders.get((address, count))) is None:
+            decoder = self._decoders[address, count] = RegisterDecoder(
+                address,
+                count,
+                (
+                    field
+                    for field in self.fields
+                    if field.address >= address and field.end <= address + count
+                ),
+            )
+        return decoder
+
+
+IDENTITY_BLOCK = RegisterBlock(
+    0x8F00,
+    29,
+    (
+        RegisterField("devtype", 0x8F00, tier=TIER_ONCE),
+        RegisterField("subtype", 0x8F01, tier=TIER_ONCE),
+        RegisterField("commver", 0x8F02, scale=0.001, precision=3, tier=TIER_ONCE),
+        RegisterField("sn", 0x8F03, width=10, kind=KIND_TEXT, tier=TIER_ONCE),
+        RegisterField("pc", 0x8F0D, width=10, kind=KIND_TEXT, tier=TIER_ONCE),
+        RegisterField("dv", 0x8F17, scale=0.001, precision=3, tier=TIER_ONCE),
+        RegisterField("mcv", 0x8F18, scale=0.001, precision=3, tier=TIER_ONCE),
+        RegisterField("scv", 0x8F19, scale=0.001, precision=3, tier=TIER_ONCE),
+        RegisterField(
+            "disphwversion", 0x8F1A, scale=0.001, precision=3, tier=TIER_ONCE
+        ),
+        RegisterField(
+            "ctrlhwversion", 0x8F1B, scale=0.001, precision=3, tier=TIER_ONCE
+        ),
+        RegisterField(
+            "powerhwversion", 0x8F1C, scale=0.001, precision=3, tier=TIER_ONCE
+        ),
+    ),
+)
+
+REALTIME_BLOCK = RegisterBlock(
+    0x100,
+    59,
+    (
+        RegisterField("mpvmode", 0x100, tier=TIER_FAST),
+        RegisterField("faultword0", 0x101, width=2, tier=TIER_FAST),
+        RegisterField("faultword1", 0x103, width=2, tier=TIER_FAST),
+        RegisterField("faultword2", 0x105, width=2, tier=TIER_FAST),
+        RegisterField("pv1volt", 0x107, scale=0.1, precision=1, tier=TIER_FAST),
+        RegisterField("pv1curr", 0x108, scale=0.01, precision=2, tier=TIER_FAST),
+        RegisterField("pv1power", 0x109, tier=TIER_FAST),
+        RegisterField("pv2volt", 0x10A, scale=0.1, precision=1, tier=TIER_FAST),
+        RegisterField("pv2curr", 0x10B, scale=0.01, precision=2, tier=TIER_FAST),
+        RegisterField("pv2power", 0x10C, tier=TIER_FAST),
+        RegisterField("pv3volt", 0x10D, scale=0.1, precision=1, tier=TIER_FAST),
+        RegisterField("pv3curr", 0x10E, scale=0.01, precision=2, tier=TIER_FAST),
+        RegisterField("pv3power", 0x10F, tier=TIER_FAST),
+        RegisterField("busvolt", 0x110, scale=0.1, precision=1, tier=TIER_FAST),
+        RegisterField(
+            "invtempc", 0x111, signed=True, scale=0.1, precision=1, tier=TIER_FAST
+        ),
+        RegisterField("gfci", 0x112, signed=True, tier=TIER_FAST),
+        RegisterField("power", 0x113, tier=TIER_FAST),
+        RegisterField("qpower", 0x114, signed=True, tier=TIER_FAST),
+        RegisterField(
+            "pf", 0x115, signed=True, scale=0.001, precision=3, tier=TIER_FAST
+        ),
+        RegisterField("l1volt", 0x116, scale=0.1, precision=1, tier=TIER_FAST),
+        RegisterField("l1curr", 0x117, scale=0.01, precision=2, tier=TIER_FAST),
+        RegisterField("l1freq", 0x118, scale=0.01, precision=2, tier=TIER_FAST),
+        RegisterField("l1dci", 0x119, signed=True, tier=TIER_FAST),
+        RegisterField("l1power", 0x11A, tier=TIER_FAST),
+        RegisterField(
+            "l1pf", 0x11B, signed=True, scale=0.001, precision=3, tier=TIER_FAST
+        ),
+        RegisterField("l2volt", 0x11C, scale=0.1, precision=1, tier=TIER_FAST),
+        RegisterField("l2curr", 0x11D, scale=0.01, precision=2, tier=TIER_FAST),
+        RegisterField("l2freq", 0x11E, scale=0.01, precision=2, tier=TIER_FAST),
+        RegisterField("l2dci", 0x11F, signed=True, tier=TIER_FAST),
+        RegisterField("l2power", 0x120, tier=TIER_FAST),
+        RegisterField(
+            "l2pf", 0x121, signed=True, scale=0.001, precision=3, tier=TIER_FAST
+        ),
+        RegisterField("l3volt", 0x122, scale=0.1, precision=1, tier=TIER_FAST),
+        RegisterField("l3curr", 0x123, scale=0.01, precision=2, tier=TIER_FAST),
+        RegisterField("l3freq", 0x124, scale=0.01, precision=2, tier=TIER_FAST),
+        RegisterField("l3dci", 0x125, signed=True, tier=TIER_FAST),
+        RegisterField("l3power", 0x126, tier=TIER_FAST),
+        RegisterField(
+            "l3pf", 0x127, signed=True, scale=0.001, precision=3, tier=TIER_FAST
+        ),
+        RegisterField("iso1", 0x128, tier=TIER_SLOW),
+        RegisterField("iso2", 0x129, tier=TIER_SLOW),
+        RegisterField("iso3", 0x12A, tier=TIER_SLOW),
+        RegisterField("iso4", 0x12B, tier=TIER_SLOW),
+        RegisterField("todayenergy", 0x12C, scale=0.01, precision=2, tier=TIER_SLOW),
+        RegisterField(
+            "monthenergy", 0x12D, width=2, scale=0.01, precision=2, tier=TIER_SLOW
+        ),
+        RegisterField(
+            "yearenergy", 0x12F, width=2, scale=0.01, precision=2, tier=TIER_SLOW
+        ),
+        RegisterField(
+            "totalenergy", 0x131, width=2, scale=0.01, precision=2, tier=TIER_SLOW
+        ),
+        RegisterField("todayhour", 0x133, scale=0.1, precision=1, tier=TIER_SLOW),
+        RegisterField(
+            "totalhour", 0x134, width=2, scale=0.1, precision=1, tier=TIER_SLOW
+        ),
+        RegisterField("errorcount", 0x136, tier=TIER_SLOW),
+        RegisterField("datetime", 0x137, width=4, kind=KIND_DATETIME, tier=TIER_SLOW),
+    ),
+)
+
+POWER_STATE_BLOCK = RegisterBlock(
+    0x1037,
+    1,
+    (RegisterField("poweronoff", 0x1037, kind=KIND_BOOL),),
+)
+
+POLLED_BLOCKS = (REALTIME_BLOCK, POWER_STATE_BLOCK)
+
+FAULT_WORD_KEYS = ("faultword0", "faultword1", "faultword2")
+
+# Data keys that are computed from other registers, with the keys they need.
+DERIVED_KEYS: dict[str, tuple[str, ...]] = {
+    "mpvstatus": ("mpvmode",),
+    "clockdrift": ("datetime",),
+    "dcpower": ("pv1power", "pv2power", "pv3power"),
+    "efficiency": ("pv1power", "pv2power", "pv3power", "power"),
+    # The energies are integrated on the inverter clock.
+    "pv1energy": ("pv1power", "datetime"),
+    "pv2energy": ("pv2power", "datetime"),
+    "pv3energy": ("pv3power", "datetime"),
+    "phaseimbalance": ("l1curr", "l2curr", "l3curr"),
+    "faultmsg": FAULT_WORD_KEYS,
+    "faultcodes": FAULT_WORD_KEYS,
+    "faultmessages": FAULT_WORD_KEYS,
+}
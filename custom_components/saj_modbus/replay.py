@@ -0,0 +1,157 @@
+"""Replay of recorded register frames in place of a gateway connection.
+
+Frames come from a ring file of the frame recorder or from a CSV file, see
+recorder.load_frames.
+
+Every read is answered with the next recorded frame that covers the
+requested range. At speed 0 the frames are served one after the other as
+fast as the hub asks for them; at other speeds the recording plays along
+with the wall clock, speed times faster, and reads get the latest frame at
+the current playback time.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from bisect import bisect_right
+from collections.abc import Iterable
+
+from pymodbus.exceptions import ConnectionException
+from pymodbus.pdu import ExceptionResponse, ModbusPDU
+
+from .connection import (
+    PRIORITY_CONTROL,
+    PRIORITY_NAMES,
+    PRIORITY_REQUEST,
+    QueueStats,
+    RawReadHoldingRegistersResponse,
+    RoundTripTime,
+)
+from .instrumentation import Instrumentation
+from .recorder import Frame
+
+_LOGGER = logging.getLogger(__name__)
+
+# Modbus exception codes, numeric as pymodbus renamed its constants in 3.11.
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_ADDRESS = 0x02
+
+
+class ReplayConnection:
+    """Serve reads from recorded frames, with the interface of a connection.
+
+    Writes are refused, the recording cannot follow them. Once the frames
+    of a range run out, or playback passes the end of the recording, reads
+    raise ConnectionException.
+    """
+
+    def __init__(self, frames: Iterable[Frame], speed: float = 0.0) -> None:
+        """Initialize the replay."""
+        self._frames: dict[int, list[Frame]] = {}
+        for frame in frames:
+            self._frames.setdefault(frame.unit, []).append(frame)
+        self._ranges: dict[tuple[int, int, int], tuple[list[Frame], list[float]]] = {}
+        self._cursors: dict[tuple[int, int, int], int] = {}
+        self._speed = speed
+        self._started: float | None = None
+        timestamps = [
+            frame.timestamp for frames in self._frames.values() for frame in frames
+        ]
+        self._first = min(timestamps, default=0.0)
+        self._last = max(timestamps, default=0.0)
+        self.queue_stats = tuple(QueueStats() for _ in PRIORITY_NAMES)
+        self.units: set[int] = set()
+        # Replayed frames have no latency worth measuring.
+        self.instruments: dict[int, Instrumentation] = {}
+        self.round_trips: dict[int, RoundTripTime] = {}
+        self.reconnects = 0
+        self.connect_failures = 0
+
+    def __str__(self) -> str:
+        """Return a description of the replay."""
+        return f"replay of {sum(map(len, self._frames.values()))} frames"
+
+    @property
+    def connected(self) -> bool:
+        """Return True while there are frames left to play."""
+        return self.playback_time <= self._last
+
+    @property
+    def connection_age(self) -> float | None:
+        """Return the number of seconds the replay has been playing."""
+        if self._started is None:
+            return None
+        return time.monotonic() - self._started
+
+    @property
+    def playback_time(self) -> float:
+        """Return the recording time that is being played."""
+        if self._started is None or not self._speed:
+            return self._first
+        return self._first + (time.monotonic() - self._started) * self._speed
+
+    def poll_offset(self, unit: int, interval: float) -> float:
+        """Return no offset, the recording already has the inverter's timing."""
+        return 0.0
+
+    def close(self) -> None:
+        """Do nothing, there is no socket."""
+
+    async def async_close(self) -> None:
+        """Do nothing, there is no socket."""
+
+    async def async_read_holding_registers(
+        self,
+        unit: int,
+        address: int,
+        count: int,
+        priority: int = PRIORITY_REQUEST,
+        deadline: float | None = None,
+    ) -> ModbusPDU:
+        """Answer a read with the recorded frame for the range."""
+        self.queue_stats[priority].add(0.0)
+        if self._started is None:
+            self._started = time.monotonic()
+        key = (unit, address, count)
+        if (recorded := self._ranges.get(key)) is None:
+            frames = [
+                frame
+                for frame in self._frames.get(unit, ())
+                if frame.address <= address
+                and address + count <= frame.address + len(frame.raw) // 2
+            ]
+            recorded = self._ranges[key] = (
+                frames,
+                [frame.timestamp for frame in frames],
+            )
+        frames, timestamps = recorded
+        if not frames:
+            _LOGGER.debug(
+                "No frames recorded for %s registers at %#06x", count, address
+            )
+            return ExceptionResponse(0x03, ILLEGAL_ADDRESS, unit)
+
+        if self._speed:
+            if (now := self.playback_time) > self._last:
+                raise ConnectionException("End of the recording")
+            index = max(bisect_right(timestamps, now) - 1, 0)
+        else:
+            index = self._cursors.get(key, 0)
+            if index >= len(frames):
+                raise ConnectionException("End of the recording")
+            self._cursors[key] = index + 1
+
+        frame = frames[index]
+        start = (address - frame.address) * 2
+        response = RawReadHoldingRegistersResponse(dev_id=unit)
+        response.decode(bytes((count * 2,)) + frame.raw[start : start + count * 2])
+        return response
+
+    async def async_write_registers(
+        self, unit: int, address: int, values: list[int]
+    ) -> ModbusPDU:
+        """Refuse a write, the recording cannot follow it."""
+        self.queue_stats[PRIORITY_CONTROL].add(0.0)
+        _LOGGER.warning("Ignoring write of %s to %#06x during replay", values, address)
+        return ExceptionResponse(0x10, ILLEGAL_FUNCTION, unit)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from typing import Any
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
@@ -10,8 +11,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import (
+from .descriptions import (
     COUNTER_SENSOR_TYPES,
+    DIAGNOSTIC_SENSOR_TYPES,
     SENSOR_TYPES,
     SajModbusSensorEntityDescription,
 )
@@ -35,6 +37,8 @@ async def async_setup_entry(
         entities.append(SajSensor(hub, device_info, sensor_description))
     for sensor_description in COUNTER_SENSOR_TYPES.values():
         entities.append(SajCounterSensor(hub, device_info, sensor_description))
+    for sensor_description in DIAGNOSTIC_SENSOR_TYPES.values():
+        entities.append(SajSensor(hub, device_info, sensor_description))
 
     async_add_entities(entities)
 
@@ -43,6 +47,7 @@ class SajSensor(CoordinatorEntity[SAJModbusHub], SensorEntity):
     """Representation of an SAJ Modbus sensor."""
 
     entity_description: SajModbusSensorEntityDescription
+    _depends_on: tuple[str, ...] = ()
 
     def __init__(
         self,
@@ -51,7 +56,10 @@ class SajSensor(CoordinatorEntity[SAJModbusHub], SensorEntity):
         description: SajModbusSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator=hub)
+        super().__init__(
+            coordinator=hub,
+            context=(description.key, *description.attribute_keys, *self._depends_on),
+        )
         self._attr_device_info = device_info
         self.entity_description = description
         self._attr_unique_id = f"{hub.name}_{self.entity_description.key}"
@@ -61,18 +69,57 @@ class SajSensor(CoordinatorEntity[SAJModbusHub], SensorEntity):
         """Return the name."""
         return f"{self.coordinator.name} {self.entity_description.name}"
 
+    @property
+    def available(self) -> bool:
+        """Return False once the value of the sensor has expired."""
+        return (
+            super().available
+            and self.coordinator.data is not None
+            and self.entity_description.key in self.coordinator.data
+        )
+
     @property
     def native_value(self):
         """Return the native value of the sensor."""
         return self.coordinator.data.get(self.entity_description.key, None)
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the values that belong to this sensor as attributes.
+
+        While the value is kept from a read that failed since, data_updated
+        holds the time of the last good read.
+        """
+        attributes: dict[str, Any] = {}
+        if self.entity_description.attribute_keys and self.coordinator.data:
+            attributes = {
+                key: self.coordinator.data.get(key)
+                for key in self.entity_description.attribute_keys
+            }
+        if updated := self.coordinator.stale_data.get(self.entity_description.key):
+            attributes["data_updated"] = updated
+        return attributes or None
+
 
 class SajCounterSensor(SajSensor):
     """Representation of a SAJ Modbus counter sensor."""
 
+    _depends_on = ("mpvmode",)
+    _last_value = None
+
+    @property
+    def available(self) -> bool:
+        """Keep the last-known value available while polling is backed off."""
+        return super().available or (
+            self.coordinator.standby and self._last_value is not None
+        )
+
     @property
     def native_value(self):
         """Return the value of the sensor."""
         if self.coordinator.data and self.coordinator.data.get("mpvmode") in (1, 2):
-            return self.coordinator.data.get(self.entity_description.key)
+            self._last_value = self.coordinator.data.get(self.entity_description.key)
+            return self._last_value
+        if self.coordinator.standby:
+            return self._last_value
         return None
@@ -4,18 +4,37 @@ import logging
 import voluptuous as vol
 
 from homeassistant.const import ATTR_DEVICE_ID
-from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
 
+from .capture import CAPTURE_FORMATS, CAPTURE_KEYS, FORMAT_CSV, MAX_CAPTURE_SAMPLES
 from .const import DOMAIN as SAJ_DOMAIN
 from .hub import SAJModbusHub
 
 _LOGGER = logging.getLogger(__name__)
 
 ATTR_DATETIME = "datetime"
+ATTR_KEYS = "keys"
+ATTR_INTERVAL = "interval"
+ATTR_DURATION = "duration"
+ATTR_SAMPLES = "samples"
+ATTR_FORMAT = "format"
+ATTR_REFRESHES = "refreshes"
+ATTR_CPU = "cpu"
+ATTR_MEMORY = "memory"
+ATTR_TOP = "top"
 SERVICE_SET_DATE_TIME = "set_datetime"
+SERVICE_SNAPSHOT_FRAMES = "snapshot_frames"
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_PROFILE = "profile"
 
 SERVICE_SET_DATE_TIME_SCHEMA = vol.All(
     vol.Schema(
@@ -26,6 +45,66 @@ SERVICE_SET_DATE_TIME_SCHEMA = vol.All(
     )
 )
 
+SERVICE_SNAPSHOT_FRAMES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+    }
+)
+
+SERVICE_START_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_KEYS): vol.All(
+            cv.ensure_list, vol.Length(min=1), [vol.In(CAPTURE_KEYS)]
+        ),
+        vol.Optional(ATTR_INTERVAL, default=1.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1)
+        ),
+        vol.Optional(ATTR_DURATION, default=300): vol.All(
+            vol.Coerce(float), vol.Range(min=1)
+        ),
+        vol.Optional(ATTR_SAMPLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_CAPTURE_SAMPLES)
+        ),
+        vol.Optional(ATTR_FORMAT, default=FORMAT_CSV): vol.In(CAPTURE_FORMATS),
+    }
+)
+
+SERVICE_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_REFRESHES, default=10): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1000)
+        ),
+        vol.Optional(ATTR_CPU, default=True): cv.boolean,
+        vol.Optional(ATTR_MEMORY, default=False): cv.boolean,
+        vol.Optional(ATTR_TOP, default=30): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=500)
+        ),
+    }
+)
+
+
+@callback
+def _async_get_hub(hass: HomeAssistant, device_id: str) -> SAJModbusHub:
+    """Return the hub of the inverter behind a device."""
+    device_registry = dr.async_get(hass)
+    device_entry = device_registry.async_get(device_id)
+    if not device_entry:
+        raise HomeAssistantError(f"Device not found: {device_id}")
+
+    # Vind de config entry die bij dit apparaat hoort
+    config_entry_id = next(iter(device_entry.config_entries))
+    config_entry = hass.config_entries.async_get_entry(config_entry_id)
+
+    if not config_entry or not hasattr(config_entry, "runtime_data"):
+        raise HomeAssistantError(f"Config entry not found for device: {device_id}")
+
+    hub: SAJModbusHub | None = config_entry.runtime_data.get("hub")
+    if not hub:
+        raise HomeAssistantError(f"Hub not found for device: {device_id}")
+    return hub
+
 
 @callback
 def async_setup_services(hass: HomeAssistant) -> None:
@@ -33,42 +112,90 @@ def async_setup_services(hass: HomeAssistant) -> None:
 
     async def async_set_date_time(service_call: ServiceCall) -> None:
         """Service handler to set the date and time on the inverter."""
-        device_registry = dr.async_get(hass)
-        device_id = service_call.data[ATTR_DEVICE_ID]
+        hub = _async_get_hub(hass, service_call.data[ATTR_DEVICE_ID])
         date_time = service_call.data.get(ATTR_DATETIME)
 
-        device_entry = device_registry.async_get(device_id)
-        if not device_entry:
-            raise HomeAssistantError(f"Device not found: {device_id}")
-
-        # Vind de config entry die bij dit apparaat hoort
-        config_entry_id = next(iter(device_entry.config_entries))
-        config_entry = hass.config_entries.async_get_entry(config_entry_id)
-
-        if not config_entry or not hasattr(config_entry, "runtime_data"):
-            raise HomeAssistantError(f"Config entry not found for device: {device_id}")
-
-        hub: SAJModbusHub | None = config_entry.runtime_data.get("hub")
-        if not hub:
-            raise HomeAssistantError(f"Hub not found for device: {device_id}")
-
         try:
-            await hass.async_add_executor_job(hub.set_date_and_time, date_time)
+            await hub.async_set_date_and_time(date_time)
         except Exception as ex:
             _LOGGER.error("Error setting date and time on inverter: %s", ex)
             raise HomeAssistantError(
                 f"Error setting date and time on inverter: {ex}"
             ) from ex
 
+    async def async_snapshot_frames(service_call: ServiceCall) -> ServiceResponse:
+        """Service handler to copy the recorded frames of an inverter to a file."""
+        hub = _async_get_hub(hass, service_call.data[ATTR_DEVICE_ID])
+
+        try:
+            path = await hub.async_snapshot_frames()
+        except OSError as ex:
+            raise HomeAssistantError(f"Error copying recorded frames: {ex}") from ex
+        return {"path": path}
+
+    async def async_start_capture(service_call: ServiceCall) -> ServiceResponse:
+        """Service handler to capture realtime values at a high rate."""
+        hub = _async_get_hub(hass, service_call.data[ATTR_DEVICE_ID])
+
+        path = await hub.async_start_capture(
+            service_call.data[ATTR_KEYS],
+            service_call.data[ATTR_INTERVAL],
+            service_call.data[ATTR_DURATION],
+            service_call.data.get(ATTR_SAMPLES),
+            service_call.data[ATTR_FORMAT],
+        )
+        return {"path": path}
+
+    async def async_profile(service_call: ServiceCall) -> ServiceResponse:
+        """Service handler to profile the next refreshes of an inverter."""
+        hub = _async_get_hub(hass, service_call.data[ATTR_DEVICE_ID])
+        if not service_call.data[ATTR_CPU] and not service_call.data[ATTR_MEMORY]:
+            raise HomeAssistantError("Enable CPU or memory profiling, or both")
+
+        try:
+            paths = await hub.async_start_profile(
+                service_call.data[ATTR_REFRESHES],
+                service_call.data[ATTR_CPU],
+                service_call.data[ATTR_MEMORY],
+                service_call.data[ATTR_TOP],
+            )
+        except RuntimeError as ex:
+            raise HomeAssistantError(str(ex)) from ex
+        return {"paths": paths}
+
     hass.services.async_register(
         SAJ_DOMAIN,
         SERVICE_SET_DATE_TIME,
         async_set_date_time,
         schema=SERVICE_SET_DATE_TIME_SCHEMA,
     )
+    hass.services.async_register(
+        SAJ_DOMAIN,
+        SERVICE_SNAPSHOT_FRAMES,
+        async_snapshot_frames,
+        schema=SERVICE_SNAPSHOT_FRAMES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        SAJ_DOMAIN,
+        SERVICE_START_CAPTURE,
+        async_start_capture,
+        schema=SERVICE_START_CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        SAJ_DOMAIN,
+        SERVICE_PROFILE,
+        async_profile,
+        schema=SERVICE_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
 
 
 @callback
 def async_unload_services(hass: HomeAssistant) -> None:
     """Unload SAJ Modbus services."""
     hass.services.async_remove(SAJ_DOMAIN, SERVICE_SET_DATE_TIME)
+    hass.services.async_remove(SAJ_DOMAIN, SERVICE_SNAPSHOT_FRAMES)
+    hass.services.async_remove(SAJ_DOMAIN, SERVICE_START_CAPTURE)
+    hass.services.async_remove(SAJ_DOMAIN, SERVICE_PROFILE)
@@ -0,0 +1,181 @@
+"""Coalescing write queue for SAJ inverter controls."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass, field
+from typing import Any
+
+from pymodbus.pdu import ModbusPDU
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class PendingWrite:
+    """A write that has not been sent yet, with everyone waiting for it."""
+
+    values: list[int]
+    key: str | None
+    value: Any
+    confirm: bool
+    futures: list[asyncio.Future[bool]] = field(default_factory=list)
+
+
+class WriteQueue:
+    """Per-register write queue with last-write-wins coalescing.
+
+    Writes to a register are sent at least min_interval seconds apart. A write
+    that is queued while another one to the same register is waiting replaces
+    it, and everyone waiting gets the result of the write that was sent.
+
+    Writes with a key are shown optimistically: on_update is called with the
+    key when the shown value changes, and with the written value once the
+    inverter accepted it.
+
+    The worker of a register is started with create_task, which gets the
+    coroutine and a task name, so the owner can track and cancel it.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[int, list[int]], Awaitable[ModbusPDU]],
+        read: Callable[[int, int], Awaitable[ModbusPDU]],
+        on_update: Callable[[str, Any], None],
+        min_interval: float,
+        create_task: Callable[[Coroutine[Any, Any, None], str], asyncio.Task[None]],
+    ) -> None:
+        """Initialize the queue."""
+        self._create_task = create_task
+        self._write = write
+        self._read = read
+        self._on_update = on_update
+        self._min_interval = min_interval
+        self._pending: dict[int, PendingWrite] = {}
+        self._workers: dict[int, asyncio.Task[None]] = {}
+        self._last_write: dict[int, float] = {}
+        self.optimistic: dict[str, Any] = {}
+        self.writes = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.confirm_latency: dict[str, float] = {}
+
+    async def async_write(
+        self,
+        address: int,
+        values: list[int],
+        key: str | None = None,
+        value: Any = None,
+        confirm: bool = True,
+    ) -> bool:
+        """Queue a write and wait until it, or a write replacing it, is done.
+
+        Returns True if the inverter accepted the write and, when confirm is
+        set, the register reads back the written values.
+        """
+        future: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        if (pending := self._pending.get(address)) is not None:
+            self.coalesced += 1
+            pending.values = values
+            pending.key = key
+            pending.value = value
+            pending.confirm = confirm
+        else:
+            pending = self._pending[address] = PendingWrite(values, key, value, confirm)
+        pending.futures.append(future)
+
+        if key is not None:
+            self.optimistic[key] = value
+            self._on_update(key, None)
+        if address not in self._workers:
+            self._workers[address] = self._create_task(
+                self._async_drain(address), f"write {address:#06x}"
+            )
+        return await future
+
+    async def async_shutdown(self) -> None:
+        """Cancel the writes that have not been sent."""
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _async_drain(self, address: int) -> None:
+        """Send the queued writes of one register, spaced min_interval apart."""
+        try:
+            while address in self._pending:
+                delay = (
+                    self._last_write.get(address, -self._min_interval)
+                    + self._min_interval
+                    - time.monotonic()
+                )
+                if delay > 0:
+                    # Writes queued while waiting replace the pending one.
+                    await asyncio.sleep(delay)
+                pending = self._pending.pop(address)
+                try:
+                    result = await self._async_send(address, pending)
+                except asyncio.CancelledError:
+                    for future in pending.futures:
+                        future.cancel()
+                    raise
+                except Exception as err:
+                    self.failures += 1
+                    self._finish(address, pending, False)
+                    for future in pending.futures:
+                        if not future.done():
+                            future.set_exception(err)
+                    continue
+                finally:
+                    self._last_write[address] = time.monotonic()
+                self._finish(address, pending, result)
+                for future in pending.futures:
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            del self._workers[address]
+            if (pending := self._pending.pop(address, None)) is not None:
+                for future in pending.futures:
+                    future.cancel()
+
+    async def _async_send(self, address: int, pending: PendingWrite) -> bool:
+        """Write the values and read them back when asked to confirm."""
+        start = time.monotonic()
+        self.writes += 1
+        response = await self._write(address, pending.values)
+        if response.isError():
+            self.failures += 1
+            _LOGGER.error("Failed to write %s to %#06x", pending.values, address)
+            return False
+        if not pending.confirm:
+            return True
+
+        response = await self._read(address, len(pending.values))
+        if response.isError():
+            _LOGGER.debug("Could not read back %#06x to confirm the write", address)
+            return True
+        if (registers := list(response.registers)) != pending.values:
+            self.failures += 1
+            _LOGGER.warning(
+                "Register %#06x reads back %s after writing %s",
+                address,
+                registers,
+                pending.values,
+            )
+            return False
+        latency = time.monotonic() - start
+        if pending.key is not None:
+            self.confirm_latency[pending.key] = latency
+        _LOGGER.debug("Write to %#06x confirmed after %.3fs", address, latency)
+        return True
+
+    def _finish(self, address: int, pending: PendingWrite, result: bool) -> None:
+        """Drop the optimistic value unless a newer write is queued for it."""
+        if pending.key is None:
+            return
+        if address not in self._pending:
+            self.optimistic.pop(pending.key, None)
+        self._on_update(pending.key, pending.value if result else None)
@@ -0,0 +1,535 @@
+"""Benchmarks for the SAJ Modbus integration.
+
+``poll`` drives SAJModbusHub instances against the simulator, started in a
+subprocess, and reports poll latency, CPU time per poll, allocations and
+throughput for each number of inverters. ``--transport sync`` polls with
+the blocking client of the integration before the async transport instead,
+to compare the latency and the executor jobs of a poll:
+
+    python scripts/benchmark.py poll --inverters 1 10 100 --rounds 20
+    python scripts/benchmark.py poll --inverters 1 10 --transport sync
+
+``decode`` times the register decoding and fault translation of one poll,
+and the memory it allocates, against the list-based decoding of the
+integration before the register map:
+
+    python scripts/benchmark.py decode
+
+``replay`` polls a hub from a recording (see ``simulator.py --record``) as
+fast as it can and reports the decode and dispatch cost per poll:
+
+    python scripts/benchmark.py replay day.frames
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "custom_components"))
+
+
+def _out(line: str = "") -> None:
+    """Write a line of the report."""
+    sys.stdout.write(f"{line}\n")
+    sys.stdout.flush()
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """Return the percentile of a list of values."""
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[int(percent) - 1]
+
+
+def _wait_for_port(host: str, port: int, timeout: float = 10) -> None:
+    """Wait until something listens on a port."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex((host, port)) == 0:
+                return
+        time.sleep(0.1)
+    raise TimeoutError(f"Simulator did not start on {host}:{port}")
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+    """Default executor that counts its jobs and the time they run."""
+
+    def __init__(self) -> None:
+        """Initialize the executor."""
+        super().__init__(thread_name_prefix="benchmark")
+        self._lock = threading.Lock()
+        self.jobs = 0
+        self.busy = 0.0
+
+    def submit(self, fn, /, *args, **kwargs):
+        """Submit a job, timing it in its thread."""
+
+        def _timed():
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.jobs += 1
+                    self.busy += time.perf_counter() - start
+
+        return super().submit(_timed)
+
+
+class _SyncPoller:
+    """Poll an inverter the way the integration did before the async transport.
+
+    A blocking ModbusTcpClient per inverter behind a lock, one executor job
+    per register read and the connection closed after every poll.
+    """
+
+    def __init__(self, hass, host: str, port: int, unit: int) -> None:
+        """Initialize the poller."""
+        from pymodbus.client import ModbusTcpClient
+
+        self.hass = hass
+        self.unit = unit
+        self.last_update_success = True
+        self._client = ModbusTcpClient(host=host, port=port, timeout=5)
+        self._lock = threading.Lock()
+
+    def _read_holding_registers(self, address: int, count: int):
+        with self._lock:
+            return self._client.read_holding_registers(
+                address=address, count=count, device_id=self.unit
+            )
+
+    def close(self) -> None:
+        """Close the connection."""
+        with self._lock:
+            self._client.close()
+
+    async def async_setup(self) -> None:
+        """Do nothing, the client connects on the first read."""
+
+    async def async_refresh(self) -> None:
+        """Read the realtime values and the power state."""
+        try:
+            realtime = await self.hass.async_add_executor_job(
+                self._read_holding_registers, 0x100, 59
+            )
+            power_state = await self.hass.async_add_executor_job(
+                self._read_holding_registers, 0x1037, 1
+            )
+            self.last_update_success = not (realtime.isError() or power_state.isError())
+            if self.last_update_success:
+                _baseline_decode(realtime.registers)
+        except Exception:  # noqa: BLE001
+            self.last_update_success = False
+        finally:
+            self.close()
+
+    async def async_close(self) -> None:
+        """Close the connection."""
+        self.close()
+
+
+async def _async_poll_rounds(
+    hubs: list, rounds: int, interval: float
+) -> tuple[list[float], int, float]:
+    """Refresh all hubs together for a number of rounds.
+
+    Returns the refresh latencies, the number of failed polls and the wall
+    time of the rounds.
+    """
+    latencies: list[float] = []
+    failed = 0
+
+    async def _async_refresh(hub) -> None:
+        nonlocal failed
+        start = time.perf_counter()
+        await hub.async_refresh()
+        latencies.append(time.perf_counter() - start)
+        if not hub.last_update_success:
+            failed += 1
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        round_start = time.perf_counter()
+        await asyncio.gather(*(_async_refresh(hub) for hub in hubs))
+        if (delay := interval - (time.perf_counter() - round_start)) > 0:
+            await asyncio.sleep(delay)
+    return latencies, failed, time.perf_counter() - start
+
+
+async def _async_bench_poll(args: argparse.Namespace, inverters: int) -> None:
+    """Benchmark polling a number of simulated inverters."""
+    from homeassistant.core import HomeAssistant
+
+    from saj_modbus.connection import PRIORITY_POLL
+    from saj_modbus.hub import SAJModbusHub
+
+    gateways = min(args.gateways, inverters)
+    units = list(range(1, inverters + 1))
+    sync = args.transport == "sync"
+    # Every sync client holds its own connection to the gateway.
+    max_connections = (
+        max(args.max_connections, inverters) if sync else args.max_connections
+    )
+    simulator = subprocess.Popen(
+        [
+            sys.executable,
+            str(ROOT / "scripts" / "simulator.py"),
+            f"--host={args.host}",
+            f"--port={args.port}",
+            f"--inverters={inverters}",
+            f"--gateways={gateways}",
+            f"--latency={args.latency}",
+            f"--jitter={args.jitter}",
+            f"--drop-rate={args.drop_rate}",
+            f"--max-connections={max_connections}",
+            "--start=12:00",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    executor = _CountingExecutor()
+    asyncio.get_running_loop().set_default_executor(executor)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hubs: list[SAJModbusHub | _SyncPoller] = []
+        try:
+            for index in range(gateways):
+                _wait_for_port(args.host, args.port + index)
+            for unit in units:
+                gateway = (unit - 1) % gateways
+                if sync:
+                    hubs.append(_SyncPoller(hass, args.host, args.port + gateway, unit))
+                    continue
+                hub = SAJModbusHub(
+                    hass,
+                    f"sim{unit}",
+                    args.host,
+                    args.port + gateway,
+                    args.scan_interval,
+                    unit=unit,
+                )
+                # Rounds are driven here, not by the refresh schedule.
+                hub._spread_polls = False
+                if args.frame_delay is not None:
+                    hub._connection._frame_delay = args.frame_delay
+                hubs.append(hub)
+            await asyncio.gather(*(hub.async_setup() for hub in hubs))
+            await _async_poll_rounds(hubs, 1, 0)
+
+            poll_stats = (
+                []
+                if sync
+                else {
+                    id(hub._connection): hub._connection.queue_stats[PRIORITY_POLL]
+                    for hub in hubs
+                }.values()
+            )
+            reads = -sum(stats.requests for stats in poll_stats)
+            expired = -sum(stats.expired for stats in poll_stats)
+            jobs, busy = executor.jobs, executor.busy
+            gc.collect()
+            cpu = time.process_time()
+            latencies, failed, wall = await _async_poll_rounds(
+                hubs, args.rounds, args.scan_interval
+            )
+            cpu = time.process_time() - cpu
+            polls = len(latencies)
+            jobs, busy = executor.jobs - jobs, executor.busy - busy
+            if sync:
+                # Two reads per poll, realtime values and power state.
+                reads = 2 * (polls - failed)
+            else:
+                reads += sum(stats.requests for stats in poll_stats)
+                expired += sum(stats.expired for stats in poll_stats)
+
+            tracemalloc.start()
+            await _async_poll_rounds(hubs, args.alloc_rounds, 0)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        finally:
+            await asyncio.gather(*(hub.async_close() for hub in hubs))
+            simulator.terminate()
+            simulator.wait()
+
+    _out(
+        f"{inverters:>9} {gateways:>8} {polls:>6} {failed:>6} {expired:>7}"
+        f" {_percentile(latencies, 50) * 1000:>8.1f}"
+        f" {_percentile(latencies, 99) * 1000:>8.1f}"
+        f" {cpu / polls * 1000:>8.3f}"
+        f" {jobs / polls:>6.1f}"
+        f" {busy / polls * 1000:>8.2f}"
+        f" {peak / 1024 / inverters:>10.1f}"
+        f" {polls / wall:>8.1f}"
+        f" {reads / wall:>8.1f}"
+    )
+
+
+def bench_poll(args: argparse.Namespace) -> None:
+    """Run the poll benchmark for every number of inverters.
+
+    The jobs and exec ms columns are the executor jobs per poll and the time
+    they kept an executor thread busy.
+    """
+    _out(f"transport: {args.transport}")
+    _out(
+        f"{'inverters':>9} {'gateways':>8} {'polls':>6} {'failed':>6} {'expired':>7}"
+        f" {'p50 ms':>8} {'p99 ms':>8} {'cpu ms':>8} {'jobs':>6} {'exec ms':>8}"
+        f" {'KiB/inv':>10}"
+        f" {'polls/s':>8} {'reads/s':>8}"
+    )
+    for inverters in args.inverters:
+        asyncio.run(_async_bench_poll(args, inverters))
+
+
+def _baseline_decode(registers: list[int]) -> dict:
+    """Decode the realtime registers the way the integration used to.
+
+    One expression per value on the list of register ints, as before the
+    register map.
+    """
+    from datetime import datetime
+
+    def signed(value: int) -> int:
+        return value - 0x10000 if value & 0x8000 else value
+
+    data: dict = {"mpvmode": registers[0]}
+    for index, key in enumerate(("faultword0", "faultword1", "faultword2")):
+        data[key] = (registers[1 + 2 * index] << 16) | registers[2 + 2 * index]
+    for string in range(3):
+        data[f"pv{string + 1}volt"] = round(registers[7 + 3 * string] * 0.1, 1)
+        data[f"pv{string + 1}curr"] = round(registers[8 + 3 * string] * 0.01, 2)
+        data[f"pv{string + 1}power"] = registers[9 + 3 * string]
+    data["busvolt"] = round(registers[16] * 0.1, 1)
+    data["invtempc"] = round(signed(registers[17]) * 0.1, 1)
+    data["gfci"] = signed(registers[18])
+    data["power"] = registers[19]
+    data["qpower"] = signed(registers[20])
+    data["pf"] = round(signed(registers[21]) * 0.001, 3)
+    for phase in range(3):
+        base = 22 + 6 * phase
+        data[f"l{phase + 1}volt"] = round(registers[base] * 0.1, 1)
+        data[f"l{phase + 1}curr"] = round(registers[base + 1] * 0.01, 2)
+        data[f"l{phase + 1}freq"] = round(registers[base + 2] * 0.01, 2)
+        data[f"l{phase + 1}dci"] = signed(registers[base + 3])
+        data[f"l{phase + 1}power"] = registers[base + 4]
+        data[f"l{phase + 1}pf"] = round(signed(registers[base + 5]) * 0.001, 3)
+    for index in range(4):
+        data[f"iso{index + 1}"] = registers[40 + index]
+    data["todayenergy"] = round(registers[44] * 0.01, 2)
+    data["monthenergy"] = round(((registers[45] << 16) | registers[46]) * 0.01, 2)
+    data["yearenergy"] = round(((registers[47] << 16) | registers[48]) * 0.01, 2)
+    data["totalenergy"] = round(((registers[49] << 16) | registers[50]) * 0.01, 2)
+    data["todayhour"] = round(registers[51] * 0.1, 1)
+    data["totalhour"] = round(((registers[52] << 16) | registers[53]) * 0.1, 1)
+    data["errorcount"] = registers[54]
+    year, month_day, hour_minute, second = registers[55:59]
+    timevalues = (
+        f"{year}{month_day >> 8:02}{month_day & 0xFF:02}"
+        f"{hour_minute >> 8:02}{hour_minute & 0xFF:02}{second >> 8:02}"
+    )
+    data["datetime"] = datetime.strptime(timevalues, "%Y%m%d%H%M%S").astimezone()
+    return data
+
+
+def _allocated(case) -> tuple[int, int]:
+    """Return the peak and retained bytes that one call allocates."""
+    case()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        result = case()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak - before, current - before
+
+
+def bench_decode(args: argparse.Namespace) -> None:
+    """Time the decoding of one poll, against the list-based baseline.
+
+    The end-to-end cases start from the response frame: the baseline lets
+    pymodbus unpack it into a list of ints and decodes value by value, the
+    integration keeps a view on the bytes and unpacks it with one struct.
+    """
+    from pymodbus.pdu.register_message import ReadHoldingRegistersResponse
+
+    from saj_modbus.connection import RawReadHoldingRegistersResponse
+    from saj_modbus.faults import decode_fault_words
+    from saj_modbus.registers import IDENTITY_BLOCK, REALTIME_BLOCK
+
+    registers = [
+        2, 0, 0x40, 0, 0, 0, 0, 3500, 512, 1792, 3400, 498, 1693, 0, 0, 0,
+        3600, 352, 3, 3321, 0, 1000, 2301, 1443, 5001, 2, 3321, 1000,
+        *([0] * 12), 2100, 2200, 0, 0, 1234, 0, 34567, 6, 63000, 18, 54321,
+        85, 0, 43210, 1, 2024, (5 << 8) | 17, (13 << 8) | 45, 12 << 8,
+    ]  # fmt: skip
+    payload = REALTIME_BLOCK.decoder._words.pack(*registers)
+    frame = bytes((len(payload),)) + payload
+    raw = memoryview(payload)
+    identity = memoryview(bytes(IDENTITY_BLOCK.count * 2))
+
+    def baseline_frame() -> dict:
+        response = ReadHoldingRegistersResponse()
+        response.decode(frame)
+        return _baseline_decode(response.registers)
+
+    def raw_frame() -> dict:
+        response = RawReadHoldingRegistersResponse()
+        response.decode(frame)
+        return REALTIME_BLOCK.decoder.decode(response.raw)
+
+    cases = {
+        "baseline: frame to values": baseline_frame,
+        "register map: frame to values": raw_frame,
+        "baseline: list to values": lambda: _baseline_decode(registers),
+        "register map: list to values": lambda: REALTIME_BLOCK.decoder.decode_registers(
+            registers
+        ),
+        "register map: bytes to values": lambda: REALTIME_BLOCK.decoder.decode(raw),
+        "identity block from bytes": lambda: IDENTITY_BLOCK.decoder.decode(identity),
+        "fault words": lambda: decode_fault_words((0x80040000, 0x1, 0x100)),
+    }
+    _out(f"{'':<31} {'time':>10} {'peak B':>8} {'kept B':>8}")
+    for name, case in cases.items():
+        timer = timeit.Timer(case)
+        loops, _ = timer.autorange()
+        best = min(timer.repeat(repeat=args.repeat, number=loops)) / loops
+        peak, kept = _allocated(case)
+        _out(f"{name:<31} {best * 1e6:7.2f} µs {peak:>8} {kept:>8}")
+
+
+async def _async_bench_replay(args: argparse.Namespace) -> None:
+    """Poll a hub from a recording until it runs out."""
+    from homeassistant.core import HomeAssistant
+
+    from saj_modbus.descriptions import COUNTER_SENSOR_TYPES, SENSOR_TYPES
+    from saj_modbus.hub import SAJModbusHub
+    from saj_modbus.recorder import load_frames
+    from saj_modbus.replay import ReplayConnection
+
+    frames = load_frames(args.path)
+    dispatched = 0
+
+    def _dispatched() -> None:
+        nonlocal dispatched
+        dispatched += 1
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hub = SAJModbusHub(
+            hass,
+            "replay",
+            "replay",
+            0,
+            args.scan_interval,
+            unit=args.unit,
+            # Stop at the end of the recording instead of serving stale values.
+            max_data_age=0,
+            connection=ReplayConnection(frames),
+        )
+        hub._spread_polls = False
+        # One listener per sensor, with the keys the sensor entity renders.
+        for description in (*SENSOR_TYPES.values(), *COUNTER_SENSOR_TYPES.values()):
+            hub.async_add_listener(
+                _dispatched, (description.key, *description.attribute_keys)
+            )
+        await hub.async_setup()
+
+        polls = 0
+        gc.collect()
+        cpu = time.process_time()
+        start = time.perf_counter()
+        while True:
+            # Every tier is due at every poll, the recording sets the pace.
+            hub._tier_next_read = dict.fromkeys(hub._tier_next_read, 0.0)
+            await hub.async_refresh()
+            if not hub.last_update_success:
+                break
+            polls += 1
+        wall = time.perf_counter() - start
+        cpu = time.process_time() - cpu
+        await hub.async_close()
+
+    _out(f"{len(frames)} frames, {polls} polls, {dispatched} state writes")
+    _out(
+        f"{wall / polls * 1e6:.1f} µs wall, {cpu / polls * 1e6:.1f} µs cpu per poll,"
+        f" {polls / wall:.0f} polls/s"
+    )
+
+
+def bench_replay(args: argparse.Namespace) -> None:
+    """Run the replay benchmark."""
+    asyncio.run(_async_bench_replay(args))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    poll = commands.add_parser("poll", help="poll simulated inverters")
+    poll.set_defaults(func=bench_poll)
+    poll.add_argument("--inverters", type=int, nargs="+", default=[1, 10, 100])
+    poll.add_argument(
+        "--gateways", type=int, default=1, help="gateways the inverters are spread over"
+    )
+    poll.add_argument("--rounds", type=int, default=20)
+    poll.add_argument(
+        "--alloc-rounds",
+        type=int,
+        default=3,
+        help="rounds traced for the peak allocated memory per inverter",
+    )
+    poll.add_argument("--scan-interval", type=int, default=1)
+    poll.add_argument("--host", default="127.0.0.1")
+    poll.add_argument("--port", type=int, default=5020)
+    poll.add_argument("--latency", type=float, default=0.01)
+    poll.add_argument("--jitter", type=float, default=0.002)
+    poll.add_argument("--drop-rate", type=float, default=0.0)
+    poll.add_argument("--max-connections", type=int, default=1)
+    poll.add_argument(
+        "--frame-delay",
+        type=float,
+        help="gap between frames of the async transport, the sync one has none",
+    )
+    poll.add_argument(
+        "--transport",
+        choices=("async", "sync"),
+        default="async",
+        help="poll with the hub, or with the blocking client it replaced",
+    )
+
+    decode = commands.add_parser("decode", help="time register decoding")
+    decode.set_defaults(func=bench_decode)
+    decode.add_argument("--repeat", type=int, default=5)
+
+    replay = commands.add_parser("replay", help="poll a hub from a recording")
+    replay.set_defaults(func=bench_replay)
+    replay.add_argument("path", help="frame recorder or CSV file")
+    replay.add_argument("--unit", type=int, default=1)
+    replay.add_argument("--scan-interval", type=int, default=5)
+    return parser
+
+
+if __name__ == "__main__":
+    arguments = build_parser().parse_args()
+    arguments.func(arguments)
@@ -0,0 +1,69 @@
+"""Export recorded register frames to columnar files.
+
+Decodes the realtime frames of a recording (see the record frames option and
+``simulator.py --record``) into one column per value and writes them to
+Parquet when pyarrow is installed, otherwise to a compressed NPZ file:
+
+    python scripts/export_frames.py day.frames day --unit 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+PACKAGE = Path(__file__).resolve().parent.parent / "custom_components" / "saj_modbus"
+
+
+def _import_package() -> None:
+    """Make saj_modbus importable without running its __init__.
+
+    The package __init__ sets up the Home Assistant integration; the modules
+    used here only need the standard library and NumPy.
+    """
+    spec = importlib.util.spec_from_file_location(
+        "saj_modbus",
+        PACKAGE / "__init__.py",
+        submodule_search_locations=[str(PACKAGE)],
+    )
+    sys.modules["saj_modbus"] = importlib.util.module_from_spec(spec)
+
+
+def main(args: argparse.Namespace) -> None:
+    """Decode a recording and write its columns."""
+    _import_package()
+    from saj_modbus.batch import decode_frames, write_columns
+    from saj_modbus.registers import IDENTITY_BLOCK, REALTIME_BLOCK
+    from saj_modbus.recorder import load_frames
+
+    block = IDENTITY_BLOCK if args.identity else REALTIME_BLOCK
+    start = time.perf_counter()
+    frames = load_frames(args.path)
+    loaded = time.perf_counter()
+    columns = decode_frames(frames, block, args.unit)
+    decoded = time.perf_counter()
+    path = write_columns(args.output, columns)
+    sys.stdout.write(
+        f"{len(columns['timestamp'])} frames to {path}: loaded in"
+        f" {loaded - start:.2f}s, decoded in {decoded - loaded:.2f}s, written in"
+        f" {time.perf_counter() - decoded:.2f}s\n"
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("path", help="frame recorder or CSV file")
+    parser.add_argument("output", help="output path, the suffix is added")
+    parser.add_argument("--unit", type=int, help="only export this unit")
+    parser.add_argument(
+        "--identity", action="store_true", help="export the identity block instead"
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    main(build_parser().parse_args())
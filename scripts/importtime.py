@@ -0,0 +1,197 @@
+"""Import-time budget of the SAJ Modbus integration.
+
+Home Assistant imports the integration, its config flow and diagnostics
+when it starts, the hub with pymodbus when an entry is set up and the entity
+platforms after that. This script times each of these stages in a fresh
+interpreter, with the Home Assistant modules they need already imported,
+and fails when a stage exceeds its budget or loads a module that belongs to
+a later stage:
+
+    python scripts/importtime.py
+    python scripts/importtime.py --runs 20 --details
+
+Bytecode is cached in a temporary directory and warmed up first, like the
+__pycache__ of an installed integration.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import NamedTuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HA_MODULES = (
+    "voluptuous",
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.components.diagnostics",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.importlib",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+)
+
+
+class Stage(NamedTuple):
+    """Modules imported together, with their budget in milliseconds."""
+
+    name: str
+    preload: tuple[str, ...]
+    modules: tuple[str, ...]
+    budget: float
+    deferred: tuple[str, ...]
+
+
+STARTUP = (
+    "saj_modbus",
+    "saj_modbus.config_flow",
+    "saj_modbus.diagnostics",
+)
+SETUP = ("saj_modbus.services",)
+PLATFORMS = ("saj_modbus.sensor", "saj_modbus.number", "saj_modbus.switch")
+
+STAGES = (
+    Stage(
+        "startup",
+        HA_MODULES,
+        STARTUP,
+        10.0,
+        (
+            "pymodbus",
+            "saj_modbus.hub",
+            "saj_modbus.registers",
+            "saj_modbus.descriptions",
+            "saj_modbus.faults",
+            "homeassistant.components.sensor",
+        ),
+    ),
+    Stage(
+        "setup",
+        HA_MODULES + STARTUP,
+        SETUP,
+        100.0,
+        ("saj_modbus.descriptions", "saj_modbus.faults", "saj_modbus.profiling"),
+    ),
+    Stage(
+        "platforms",
+        HA_MODULES
+        + STARTUP
+        + SETUP
+        + (
+            "homeassistant.components.number",
+            "homeassistant.components.sensor",
+            "homeassistant.components.switch",
+        ),
+        PLATFORMS,
+        20.0,
+        ("saj_modbus.faults",),
+    ),
+)
+
+CHILD = """
+import json, sys, time
+for name in {preload!r}:
+    __import__(name)
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+sys.stdout.write(json.dumps([elapsed, sorted(sys.modules)]))
+"""
+
+
+def _out(line: str = "") -> None:
+    """Write a line of the report."""
+    sys.stdout.write(f"{line}\n")
+    sys.stdout.flush()
+
+
+def _run(
+    stage: Stage, cache: str, importtime: bool = False
+) -> tuple[float, list[str], str]:
+    """Import a stage in a fresh interpreter.
+
+    Returns the import time in seconds, the loaded modules and the
+    -X importtime report when asked for.
+    """
+    env = {**os.environ, "PYTHONPATH": str(ROOT / "custom_components")}
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    command = [sys.executable, "-X", f"pycache_prefix={cache}"]
+    if importtime:
+        command += ["-X", "importtime"]
+    result = subprocess.run(
+        [
+            *command,
+            "-c",
+            CHILD.format(preload=stage.preload, modules=stage.modules),
+        ],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    )
+    elapsed, modules = json.loads(result.stdout)
+    return elapsed, modules, result.stderr
+
+
+def _details(report: str, preload: tuple[str, ...], top: int = 10) -> None:
+    """Print the slowest modules of a stage from an -X importtime report."""
+    rows = []
+    for line in report.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        if own.strip().isdigit():
+            rows.append((int(own), int(cumulative), name.strip()))
+    # The report lists the preloaded modules first, the stage starts after the
+    # last of them.
+    last = max(
+        (index for index, row in enumerate(rows) if row[2] in preload), default=-1
+    )
+    for own, cumulative, name in sorted(rows[last + 1 :], reverse=True)[:top]:
+        _out(f"    {own / 1000:7.2f} ms own {cumulative / 1000:8.2f} ms total  {name}")
+
+
+def main() -> int:
+    """Time the import stages and check them against their budgets."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="runs per stage")
+    parser.add_argument(
+        "--details", action="store_true", help="list the slowest modules"
+    )
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as cache:
+        for stage in STAGES:
+            _run(stage, cache)
+            times = []
+            for _ in range(args.runs):
+                elapsed, modules, _report = _run(stage, cache)
+                times.append(elapsed * 1000)
+            loaded = sorted(set(stage.deferred) & set(modules))
+            median = statistics.median(times)
+            ok = median <= stage.budget and not loaded
+            failed |= not ok
+            _out(
+                f"{stage.name:<10} {median:7.2f} ms (min {min(times):.2f}), "
+                f"budget {stage.budget:.0f} ms  {'ok' if ok else 'FAIL'}"
+            )
+            if loaded:
+                _out(f"    imports {', '.join(loaded)} too early")
+            if args.details:
+                _details(_run(stage, cache, importtime=True)[2], stage.preload)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,515 @@
+"""Simulated SAJ R5 inverters behind a Modbus TCP gateway.
+
+Serves the identity block, the realtime block, the power state, the power
+limit and the clock of one or more inverters on an RS485 bus, with the
+latency, jitter, dropped responses and connection limit of a WiFi or
+Ethernet dongle. PV power follows the sun on a simulated clock with passing
+clouds, and faults come and go at random.
+
+    python scripts/simulator.py --port 5020 --inverters 3 --latency 0.05
+
+With --record, a day of 5-second polls is written to a frame recorder file
+that can be replayed by the integration instead:
+
+    python scripts/simulator.py --record day.frames --duration 24 --step 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import math
+import random
+import struct
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from pymodbus.datastore import ModbusServerContext
+from pymodbus.exceptions import NoSuchIdException
+from pymodbus.server import ModbusTcpServer
+
+_LOGGER = logging.getLogger("saj_simulator")
+
+IDENTITY_ADDRESS = 0x8F00
+IDENTITY_COUNT = 29
+REALTIME_ADDRESS = 0x100
+REALTIME_COUNT = 59
+POWER_STATE_ADDRESS = 0x1037
+LIMIT_POWER_ADDRESS = 0x801F
+DATETIME_ADDRESS = 0x8020
+
+RATED_POWER = 5000
+FAULT_DURATION = 120
+
+
+def _text(value: str, count: int) -> list[int]:
+    """Encode text into big-endian registers, padded with NUL."""
+    data = value.encode("latin-1").ljust(count * 2, b"\0")[: count * 2]
+    return [int.from_bytes(data[i : i + 2], "big") for i in range(0, len(data), 2)]
+
+
+def _words(value: int) -> list[int]:
+    """Split an unsigned 32-bit value into two registers."""
+    return [(value >> 16) & 0xFFFF, value & 0xFFFF]
+
+
+def _clock(value: datetime) -> list[int]:
+    """Encode a date and time like the inverter does."""
+    return [
+        value.year,
+        (value.month << 8) | value.day,
+        (value.hour << 8) | value.minute,
+        value.second << 8,
+    ]
+
+
+class SimulatedClock:
+    """Wall clock that runs speed times faster from a start time."""
+
+    def __init__(self, start: datetime, speed: float) -> None:
+        """Initialize the clock."""
+        self._start = start
+        self._started = time.monotonic()
+        self.speed = speed
+
+    def now(self) -> datetime:
+        """Return the simulated time."""
+        return self._start + timedelta(
+            seconds=(time.monotonic() - self._started) * self.speed
+        )
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward."""
+        self._start += timedelta(seconds=seconds)
+
+
+class SimulatedInverter:
+    """Holding registers of one SAJ R5 inverter."""
+
+    def __init__(self, unit: int, clock: SimulatedClock, fault_rate: float) -> None:
+        """Initialize the inverter."""
+        self.unit = unit
+        self._clock = clock
+        self._fault_rate = fault_rate
+        self._random = random.Random(unit)
+        self._clouds = 1.0
+        self._strings = (1.0, self._random.uniform(0.6, 0.95))
+        self._identity = [
+            0x0002,
+            0x0152,
+            1100,
+            *_text(f"R5S2{unit:04d}SIM{self._random.randrange(10**6):06d}", 10),
+            *_text("R5-5K-S2", 10),
+            1203,
+            1010,
+            1020,
+            1000,
+            1000,
+            1000,
+        ]
+        self.power_on = True
+        self.limit_power = 1100
+        self.clock_offset = timedelta()
+        self.faults = [0, 0, 0]
+        self._fault_until = 0.0
+        self._energy = 12_345_678.0
+        self._today = 0.0
+        self._hours = 4321.0
+        self._updated = clock.now()
+        self.reads = 0
+        self.writes = 0
+
+    def now(self) -> datetime:
+        """Return the inverter clock."""
+        return self._clock.now() + self.clock_offset
+
+    def _irradiance(self, now: datetime) -> float:
+        """Return the relative PV power at a moment, 0 at night."""
+        hour = now.hour + now.minute / 60 + now.second / 3600
+        sun = max(0.0, math.sin(math.pi * (hour - 6) / 14)) if 6 < hour < 20 else 0.0
+        self._clouds = min(1.0, max(0.2, self._clouds + self._random.gauss(0, 0.05)))
+        return sun * self._clouds
+
+    def _update_faults(self) -> None:
+        """Start and clear faults at random."""
+        now = self._clock.now().timestamp()
+        if any(self.faults) and now > self._fault_until:
+            self.faults = [0, 0, 0]
+        elif not any(self.faults) and self._random.random() < self._fault_rate:
+            self.faults[self._random.randrange(3)] = 1 << self._random.randrange(32)
+            self._fault_until = now + FAULT_DURATION
+
+    def realtime(self) -> list[int]:
+        """Return the realtime block at the current simulated time."""
+        now = self.now()
+        elapsed = (self._clock.now() - self._updated).total_seconds()
+        self._updated = self._clock.now()
+        self._update_faults()
+
+        sun = self._irradiance(now)
+        strings = [RATED_POWER / 2 * sun * share for share in self._strings]
+        voltages = [250 + 120 * math.sqrt(sun) if sun else 0.0 for _ in strings]
+        ac_power = 0.0
+        if self.power_on and sun > 0.01:
+            ac_power = min(sum(strings) * 0.97, RATED_POWER * self.limit_power / 1000)
+        mode = 2 if ac_power else 1 if self.power_on else 0
+        if any(self.faults):
+            mode = 3
+        # Energy in Wh, running hours in hours.
+        self._energy += ac_power * elapsed / 3600
+        self._today = 0.0 if now.hour < 1 else self._today + ac_power * elapsed / 3600
+        if ac_power:
+            self._hours += elapsed / 3600
+        grid_volt = 2300 + self._random.randint(-20, 20)
+
+        registers = [
+            mode,
+            *_words(self.faults[0]),
+            *_words(self.faults[1]),
+            *_words(self.faults[2]),
+        ]
+        for power, volt in zip(strings, voltages):
+            registers += [
+                round(volt * 10),
+                round(power / volt * 100) if volt else 0,
+                round(power),
+            ]
+        registers += [0, 0, 0]
+        registers += [
+            3600,
+            round(250 + 200 * sun),
+            self._random.randint(0, 5),
+            round(ac_power),
+            0,
+            1000,
+            grid_volt,
+            round(ac_power / grid_volt * 1000),
+            5000 + self._random.randint(-3, 3),
+            self._random.randint(0, 3),
+            round(ac_power),
+            1000,
+        ]
+        registers += [0] * 12
+        registers += [2100, 2200, 0, 0]
+        registers += [
+            round(self._today / 10),
+            *_words(round(self._energy / 10) % 50_000),
+            *_words(round(self._energy / 10) % 600_000),
+            *_words(round(self._energy / 10)),
+            round(self._hours % 24 * 10),
+            *_words(round(self._hours * 10)),
+            len([word for word in self.faults if word]),
+            *_clock(now),
+        ]
+        return [value & 0xFFFF for value in registers]
+
+    def read(self, address: int, count: int) -> list[int]:
+        """Return count registers starting at address."""
+        self.reads += 1
+        registers: dict[int, int] = {}
+        if address < REALTIME_ADDRESS + REALTIME_COUNT and (
+            address + count > REALTIME_ADDRESS
+        ):
+            registers.update(enumerate(self.realtime(), REALTIME_ADDRESS))
+        registers.update(enumerate(self._identity, IDENTITY_ADDRESS))
+        registers[POWER_STATE_ADDRESS] = int(self.power_on)
+        registers[LIMIT_POWER_ADDRESS] = self.limit_power
+        registers.update(enumerate(_clock(self.now()), DATETIME_ADDRESS))
+        return [registers.get(index, 0) for index in range(address, address + count)]
+
+    def write(self, address: int, values: list[int]) -> None:
+        """Apply written registers."""
+        self.writes += 1
+        for index, value in enumerate(values, address):
+            if index == POWER_STATE_ADDRESS:
+                self.power_on = bool(value)
+            elif index == LIMIT_POWER_ADDRESS:
+                self.limit_power = min(value, 1100)
+        if address == DATETIME_ADDRESS and len(values) == 4:
+            year, month_day, hour_minute, second = values
+            written = datetime(
+                year,
+                month_day >> 8,
+                month_day & 0xFF,
+                hour_minute >> 8,
+                hour_minute & 0xFF,
+                second >> 8,
+            )
+            self.clock_offset = written - self._clock.now()
+
+
+class SimulatedBus:
+    """The RS485 side of the gateway: one frame at a time, with latency.
+
+    Implements the two methods pymodbus calls on a device context, so it
+    does not depend on the base class, which pymodbus renamed in 3.13.
+    """
+
+    def __init__(
+        self,
+        inverter: SimulatedInverter,
+        lock: asyncio.Lock,
+        latency: float,
+        jitter: float,
+    ) -> None:
+        """Initialize the bus access of one inverter."""
+        self.inverter = inverter
+        self._lock = lock
+        self._latency = latency
+        self._jitter = jitter
+
+    async def _async_wait(self) -> None:
+        """Take the time the frame needs on the bus."""
+        await asyncio.sleep(max(0.0, random.gauss(self._latency, self._jitter)))
+
+    async def async_getValues(
+        self, fc_as_hex: int, address: int, count: int = 1
+    ) -> list[int]:
+        """Read registers of the inverter."""
+        async with self._lock:
+            await self._async_wait()
+            return self.inverter.read(address, count)
+
+    async def async_setValues(
+        self, fc_as_hex: int, address: int, values: list[int]
+    ) -> None:
+        """Write registers of the inverter."""
+        async with self._lock:
+            await self._async_wait()
+            self.inverter.write(address, values)
+
+
+class GatewayContext(ModbusServerContext):
+    """Unit lookup of the gateway that loses a share of the requests.
+
+    pymodbus up to 3.11 looks the device context up by item, later versions
+    call the server context with the device ID; both are served here, and
+    the base class, whose constructor changed with every version, is not
+    initialized.
+    """
+
+    def __init__(self, devices: dict[int, SimulatedBus], drop_rate: float) -> None:
+        """Initialize the gateway."""
+        self._devices = devices
+        self._drop_rate = drop_rate
+        self.dropped = 0
+        self.single = False
+        # Hand the server this context as it is, from pymodbus 3.13 on.
+        self.simdevices: list = []
+        self.old_simulator = True
+
+    def __getitem__(self, device_id: int) -> SimulatedBus:
+        """Return the inverter, or drop the request without a response."""
+        if random.random() < self._drop_rate:
+            self.dropped += 1
+            raise NoSuchIdException(f"dropped request to {device_id}")
+        if (bus := self._devices.get(device_id)) is None:
+            raise NoSuchIdException(f"no inverter with unit {device_id}")
+        return bus
+
+    async def async_getValues(
+        self, device_id: int, fc_as_hex: int, address: int, count: int = 1
+    ) -> list[int]:
+        """Read registers of an inverter."""
+        return await self[device_id].async_getValues(fc_as_hex, address, count)
+
+    async def async_setValues(
+        self, device_id: int, fc_as_hex: int, address: int, values: list[int]
+    ) -> None:
+        """Write registers of an inverter."""
+        await self[device_id].async_setValues(fc_as_hex, address, values)
+
+    def device_ids(self) -> list[int]:
+        """Return the unit IDs of the inverters."""
+        return list(self._devices)
+
+    # pymodbus 3.10 name
+    device_id = device_ids
+
+
+class GatewayServer(ModbusTcpServer):
+    """Modbus TCP server that accepts a limited number of connections.
+
+    Like the EW11 dongles, a new connection beyond the limit pushes out the
+    oldest one.
+    """
+
+    def __init__(self, context: GatewayContext, max_connections: int, **kwargs) -> None:
+        """Initialize the server."""
+        super().__init__(context, ignore_missing_devices=True, **kwargs)
+        self.max_connections = max_connections
+
+    def callback_new_connection(self):
+        """Accept a connection, closing the oldest ones above the limit."""
+        excess = len(self.active_connections) - self.max_connections + 1
+        for handler in list(self.active_connections.values())[: max(excess, 0)]:
+            _LOGGER.info("Connection limit reached, closing the oldest connection")
+            handler.close()
+        return super().callback_new_connection()
+
+
+def create_gateway(
+    host: str,
+    port: int,
+    units: list[int],
+    clock: SimulatedClock,
+    latency: float = 0.03,
+    jitter: float = 0.01,
+    drop_rate: float = 0.0,
+    fault_rate: float = 0.001,
+    max_connections: int = 1,
+) -> GatewayServer:
+    """Create a gateway serving simulated inverters with the given unit IDs."""
+    lock = asyncio.Lock()
+    devices = {
+        unit: SimulatedBus(
+            SimulatedInverter(unit, clock, fault_rate), lock, latency, jitter
+        )
+        for unit in units
+    }
+    return GatewayServer(
+        GatewayContext(devices, drop_rate),
+        max_connections,
+        address=(host, port),
+    )
+
+
+def _start_time(args: argparse.Namespace) -> datetime:
+    """Return the simulated start time."""
+    if not args.start:
+        return datetime.now()
+    return datetime.combine(
+        datetime.now().date(), datetime.strptime(args.start, "%H:%M").time()
+    )
+
+
+async def async_main(args: argparse.Namespace) -> None:
+    """Serve the simulated inverters until interrupted."""
+    clock = SimulatedClock(_start_time(args), args.speed)
+    servers = []
+    units = list(range(1, args.inverters + 1))
+    for index in range(args.gateways):
+        gateway_units = units[index :: args.gateways]
+        server = create_gateway(
+            args.host,
+            args.port + index,
+            gateway_units,
+            clock,
+            latency=args.latency,
+            jitter=args.jitter,
+            drop_rate=args.drop_rate,
+            fault_rate=args.fault_rate,
+            max_connections=args.max_connections,
+        )
+        await server.serve_forever(background=True)
+        servers.append(server)
+        _LOGGER.info(
+            "Gateway %s:%s serving units %s",
+            args.host,
+            args.port + index,
+            ", ".join(map(str, gateway_units)),
+        )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for server in servers:
+            await server.shutdown()
+
+
+def record(args: argparse.Namespace) -> None:
+    """Write the polls of the simulated inverters to a frame recorder file."""
+    sys.path.insert(
+        0, str(Path(__file__).resolve().parent.parent / "custom_components")
+    )
+    from saj_modbus.recorder import FrameRecorder
+
+    clock = SimulatedClock(_start_time(args), 0.0)
+    inverters = [
+        SimulatedInverter(unit, clock, args.fault_rate)
+        for unit in range(1, args.inverters + 1)
+    ]
+    reads = (
+        (IDENTITY_ADDRESS, IDENTITY_COUNT),
+        (REALTIME_ADDRESS, REALTIME_COUNT),
+        (POWER_STATE_ADDRESS, 1),
+    )
+    steps = int(args.duration * 3600 / args.step)
+    recorder = FrameRecorder(
+        args.record, slots=len(inverters) * (1 + steps * (len(reads) - 1))
+    )
+    recorder.open()
+    try:
+        for step in range(steps):
+            timestamp = clock.now().timestamp()
+            for inverter in inverters:
+                # The identity block is read once, at setup.
+                for address, count in reads[0 if step == 0 else 1 :]:
+                    values = inverter.read(address, count)
+                    recorder.append(
+                        inverter.unit,
+                        address,
+                        struct.pack(f">{count}H", *values),
+                        timestamp,
+                    )
+            clock.advance(args.step)
+    finally:
+        recorder.close()
+    _LOGGER.info("Recorded %s frames to %s", recorder.frames, args.record)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the command line parser."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument(
+        "--port", type=int, default=5020, help="port of the first gateway"
+    )
+    parser.add_argument("--inverters", type=int, default=1, help="number of inverters")
+    parser.add_argument(
+        "--gateways",
+        type=int,
+        default=1,
+        help="number of gateways on consecutive ports, inverters are spread over them",
+    )
+    parser.add_argument("--latency", type=float, default=0.03, help="seconds per frame")
+    parser.add_argument("--jitter", type=float, default=0.01, help="seconds")
+    parser.add_argument(
+        "--drop-rate",
+        type=float,
+        default=0.0,
+        help="share of requests without response",
+    )
+    parser.add_argument(
+        "--fault-rate", type=float, default=0.001, help="chance of a fault per read"
+    )
+    parser.add_argument(
+        "--max-connections", type=int, default=1, help="connections per gateway"
+    )
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="simulated clock speed"
+    )
+    parser.add_argument("--start", help="simulated start time of day, HH:MM")
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="write polls to a frame recorder file instead of serving them",
+    )
+    parser.add_argument("--duration", type=float, default=24, help="hours to record")
+    parser.add_argument(
+        "--step", type=float, default=5, help="seconds between recorded polls"
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    arguments = build_parser().parse_args()
+    if arguments.record:
+        record(arguments)
+    else:
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(async_main(arguments))
@@ -0,0 +1 @@
+"""Tests for the SAJ Modbus integration."""
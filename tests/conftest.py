@@ -0,0 +1,55 @@
+"""Fixtures for the SAJ Modbus tests."""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
+
+import pytest_asyncio
+
+from homeassistant.core import HomeAssistant
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "custom_components"))
+
+from saj_modbus.hub import SAJModbusHub  # noqa: E402
+from saj_modbus.recorder import load_frames  # noqa: E402
+from saj_modbus.replay import ReplayConnection  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+@pytest_asyncio.fixture
+async def hass(tmp_path: Path) -> AsyncIterator[HomeAssistant]:
+    """Return a Home Assistant instance that is not started."""
+    hass = HomeAssistant(str(tmp_path))
+    yield hass
+    await hass.async_stop(force=True)
+
+
+@pytest_asyncio.fixture
+async def replay_hub(
+    hass: HomeAssistant,
+) -> AsyncIterator[Callable[..., Awaitable[SAJModbusHub]]]:
+    """Return a factory of hubs set up from a recording in the fixtures."""
+    hubs: list[SAJModbusHub] = []
+
+    async def _create(recording: str = "replay.csv", **kwargs) -> SAJModbusHub:
+        hub = SAJModbusHub(
+            hass,
+            "replay",
+            "replay",
+            0,
+            5,
+            connection=ReplayConnection(load_frames(str(FIXTURES / recording))),
+            **kwargs,
+        )
+        # Refreshes are driven by the tests, not by the schedule.
+        hub._spread_polls = False
+        hubs.append(hub)
+        await hub.async_setup()
+        return hub
+
+    yield _create
+    for hub in hubs:
+        await hub.async_close()
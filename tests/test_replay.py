@@ -0,0 +1,128 @@
+"""Replay a recorded inverter through the hub and check the decoded values."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from saj_modbus.hub import SAJModbusHub
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _async_poll(hub: SAJModbusHub) -> None:
+    """Refresh the hub with every tier due, the recording sets the pace."""
+    hub._tier_next_read = dict.fromkeys(hub._tier_next_read, 0.0)
+    await hub.async_refresh()
+
+
+async def test_identity(replay_hub) -> None:
+    """The identity block is decoded at setup."""
+    hub = await replay_hub()
+
+    assert hub.inverter_data == {
+        "devtype": 2,
+        "subtype": 338,
+        "commver": 1.1,
+        "sn": "R5S2TEST000001",
+        "pc": "R5-5K-S2",
+        "dv": 1.203,
+        "mcv": 1.01,
+        "scv": 1.02,
+        "disphwversion": 1.0,
+        "ctrlhwversion": 1.0,
+        "powerhwversion": 1.0,
+    }
+
+
+async def test_realtime_data(replay_hub) -> None:
+    """The realtime block is decoded with its scales, signs and word pairs."""
+    hub = await replay_hub()
+
+    data = await hub.read_modbus_r5_realtime_data()
+
+    assert data["mpvmode"] == 2
+    assert data["mpvstatus"] == "Normal"
+    assert (data["pv1volt"], data["pv1curr"], data["pv1power"]) == (350.0, 5.0, 1750)
+    assert (data["pv2volt"], data["pv2curr"], data["pv2power"]) == (340.0, 4.5, 1530)
+    assert data["busvolt"] == 700.0
+    assert data["invtempc"] == -5.3
+    assert data["gfci"] == 12
+    assert data["power"] == 3100
+    assert data["qpower"] == -150
+    assert data["pf"] == 0.99
+    assert (data["l1volt"], data["l1curr"], data["l1freq"]) == (230.1, 4.5, 50.0)
+    assert (data["l2dci"], data["l2power"], data["l2pf"]) == (-2, 1045, 0.995)
+    assert data["iso4"] == 1030
+    assert data["todayenergy"] == 12.34
+    assert data["monthenergy"] == 345.67
+    assert data["yearenergy"] == 4321.0
+    assert data["totalenergy"] == 98765.43
+    assert data["todayhour"] == 5.5
+    assert data["totalhour"] == 12345.6
+    assert data["errorcount"] == 2
+    assert data["datetime"] == datetime(
+        2024, 6, 10, 12, 30, 15, tzinfo=dt_util.get_default_time_zone()
+    )
+    assert data["faultmsg"] == ""
+
+
+async def test_faults_and_unset_clock(replay_hub) -> None:
+    """Fault words are translated and an unset clock decodes as None."""
+    hub = await replay_hub()
+
+    await _async_poll(hub)
+    assert hub.last_update_success
+    assert hub.data["poweronoff"] is True
+    assert hub.data["faultcodes"] == ()
+    assert hub.data["dcpower"] == 3280
+    assert hub.data["efficiency"] == 94.5
+    assert hub.data["phaseimbalance"] == 0.4
+
+    await _async_poll(hub)
+    assert hub.last_update_success
+    assert hub.data["mpvstatus"] == "Error"
+    assert (
+        hub.data["faultword0"],
+        hub.data["faultword1"],
+        hub.data["faultword2"],
+    ) == (0x101, 0x80000000, 0)
+    assert hub.data["faultcodes"] == (38, 33, 32)
+    assert hub.data["faultmsg"] == (
+        "Code 38: Master HWBus Voltage High, Code 33: Master Bus Voltage High,"
+        " Code 32: Master Bus Voltage Balance Error"
+    )
+    assert hub.data["datetime"] is None
+    assert hub.data["poweronoff"] is False
+
+
+async def test_failed_reads_keep_stale_values(replay_hub) -> None:
+    """Ranges that fail to read keep their last values, marked stale."""
+    hub = await replay_hub()
+    await _async_poll(hub)
+    await _async_poll(hub)
+    assert not hub.stale_data
+
+    # The recording ends, like a connection that is lost.
+    await _async_poll(hub)
+
+    assert hub.last_update_success
+    assert hub.data["power"] == 3100
+    assert hub.data["mpvstatus"] == "Error"
+    assert hub.data["poweronoff"] is False
+    assert {"power", "faultword0", "poweronoff"} <= hub.stale_data.keys()
+
+
+async def test_failed_reads_without_max_data_age(replay_hub) -> None:
+    """Without a max data age, failed reads fail the refresh."""
+    hub = await replay_hub(max_data_age=0)
+    await _async_poll(hub)
+    await _async_poll(hub)
+
+    await _async_poll(hub)
+
+    assert not hub.last_update_success
+    assert not hub.stale_data